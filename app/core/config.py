@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 load_dotenv()
 
@@ -17,7 +17,118 @@ class Settings(BaseModel):
     POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "localhost")
     POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
     DB_LOGS: bool = os.getenv("DB_LOGS", False)
-    
+
+    # In-process cache of per-document embedding matrices used by retrieval
+    EMBEDDING_CACHE_MAX_MB: int = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "512"))
+
+    # Chunk retrieval backend: "python" (NumPy over cached matrices) or
+    # "pgvector" (top-k pushed into SQL, requires the pgvector migration)
+    VECTOR_BACKEND: str = os.getenv("VECTOR_BACKEND", "python")
+    EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", "1536"))
+    PGVECTOR_INDEX: str = os.getenv("PGVECTOR_INDEX", "hnsw")
+    # HNSW candidate list per query on pgvector < 0.8 (no iterative scans)
+    PGVECTOR_EF_SEARCH: int = int(os.getenv("PGVECTOR_EF_SEARCH", "400"))
+
+    # Binary storage format of DocumentChunk.embedding: float32, float16 or int8
+    EMBEDDING_STORAGE_FORMAT: str = os.getenv("EMBEDDING_STORAGE_FORMAT", "float32")
+
+    # Batched embedding generation during ingestion
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_MAX_CONCURRENCY: int = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+    EMBEDDING_MAX_RETRIES: int = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+
+    # Background ingestion workers started with the API (0 = run them standalone)
+    INGESTION_WORKERS: int = int(os.getenv("INGESTION_WORKERS", "1"))
+    INGESTION_POLL_INTERVAL: float = float(os.getenv("INGESTION_POLL_INTERVAL", "2"))
+    # A running job without heartbeat for this long is reclaimed by another worker
+    INGESTION_JOB_LEASE_SECONDS: float = float(os.getenv("INGESTION_JOB_LEASE_SECONDS", "900"))
+    INGESTION_JOB_MAX_ATTEMPTS: int = int(os.getenv("INGESTION_JOB_MAX_ATTEMPTS", "3"))
+
+    # Bulk DocumentChunk writes (COPY is only used on Postgres + psycopg2)
+    CHUNK_INSERT_BATCH_SIZE: int = int(os.getenv("CHUNK_INSERT_BATCH_SIZE", "1000"))
+    CHUNK_INSERT_USE_COPY: bool = os.getenv("CHUNK_INSERT_USE_COPY", "false").lower() == "true"
+
+    # Persistent (model, sha256(text)) -> embedding cache consulted before the API
+    TEXT_EMBEDDING_CACHE_ENABLED: bool = (
+        os.getenv("TEXT_EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    )
+    TEXT_EMBEDDING_CACHE_PATH: str = os.path.expanduser(
+        os.getenv("TEXT_EMBEDDING_CACHE_PATH", "~/.cache/crecenia-chatbot/embeddings.sqlite3")
+    )
+    TEXT_EMBEDDING_CACHE_MAX_MB: int = int(os.getenv("TEXT_EMBEDDING_CACHE_MAX_MB", "1024"))
+    # A cache hit only rewrites last_used when it is older than this
+    TEXT_EMBEDDING_CACHE_TOUCH_SECONDS: float = float(
+        os.getenv("TEXT_EMBEDDING_CACHE_TOUCH_SECONDS", "3600")
+    )
+
+    # Document uploads (streamed to content-addressed files)
+    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", os.getenv("DOCS_PATH", "data/docs"))
+    UPLOAD_MAX_MB: int = int(os.getenv("UPLOAD_MAX_MB", "200"))
+    UPLOAD_CHUNK_KB: int = int(os.getenv("UPLOAD_CHUNK_KB", "1024"))
+
+    # Process-pool text extraction (0 workers = one per CPU)
+    EXTRACTION_WORKERS: int = int(os.getenv("EXTRACTION_WORKERS", "0"))
+    EXTRACTION_TIMEOUT: float = float(os.getenv("EXTRACTION_TIMEOUT", "300"))
+    EXTRACTION_PAGES_PER_TASK: int = int(os.getenv("EXTRACTION_PAGES_PER_TASK", "50"))
+
+    # On-disk cache of extracted text keyed by sha256(file) + extractor version
+    TEXT_CACHE_ENABLED: bool = os.getenv("TEXT_CACHE_ENABLED", "true").lower() == "true"
+    TEXT_CACHE_DIR: str = os.getenv("TEXT_CACHE_DIR", "data/cache/text")
+    TEXT_CACHE_MAX_MB: int = int(os.getenv("TEXT_CACHE_MAX_MB", "1024"))
+
+    # FAISS indexes of the Drive RAG pipeline, keyed by file ids + versions
+    FAISS_INDEX_CACHE_ENABLED: bool = (
+        os.getenv("FAISS_INDEX_CACHE_ENABLED", "true").lower() == "true"
+    )
+    FAISS_INDEX_CACHE_DIR: str = os.getenv("FAISS_INDEX_CACHE_DIR", "data/cache/faiss")
+    FAISS_INDEX_CACHE_MAX_MB: int = int(os.getenv("FAISS_INDEX_CACHE_MAX_MB", "2048"))
+
+    # Parent of the per-run scratch directories of the Drive RAG pipeline
+    RAG_WORKSPACE_DIR: str = os.getenv("RAG_WORKSPACE_DIR", "data/runs")
+
+    # Parallel Drive downloads (bytes per MediaIoBaseDownload request)
+    DRIVE_DOWNLOAD_WORKERS: int = int(os.getenv("DRIVE_DOWNLOAD_WORKERS", "8"))
+    DRIVE_DOWNLOAD_CHUNK_MB: int = int(os.getenv("DRIVE_DOWNLOAD_CHUNK_MB", "100"))
+
+    # Local mirror of downloaded Drive files, revalidated by md5Checksum/modifiedTime
+    DRIVE_MIRROR_ENABLED: bool = os.getenv("DRIVE_MIRROR_ENABLED", "true").lower() == "true"
+    DRIVE_MIRROR_DIR: str = os.getenv("DRIVE_MIRROR_DIR", "data/cache/drive")
+    DRIVE_MIRROR_MAX_MB: int = int(os.getenv("DRIVE_MIRROR_MAX_MB", "4096"))
+
+    # Seconds a Drive file listing is reused (0 = always query Drive)
+    DRIVE_LIST_CACHE_TTL: int = int(os.getenv("DRIVE_LIST_CACHE_TTL", "300"))
+
+    # Chunk sizing ("chars" or "tokens") and the local tokenizer
+    CHUNK_UNIT: str = os.getenv("CHUNK_UNIT", "chars")
+    CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "800"))
+    CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "150"))
+    TOKENIZER_ENCODING: str = os.getenv("TOKENIZER_ENCODING", "cl100k_base")
+    # Directory holding the pre-downloaded tiktoken file (never fetched at runtime)
+    TIKTOKEN_CACHE_DIR: str = os.getenv("TIKTOKEN_CACHE_DIR", "")
+
+    # Token budget of the retrieved context in chat prompts
+    CHAT_CONTEXT_MAX_TOKENS: int = int(os.getenv("CHAT_CONTEXT_MAX_TOKENS", "3000"))
+
+    # Shared HTTP connection pool of the OpenAI clients
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+    OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", "60"))
+
+    # Connection pool of the async (asyncpg) engine used by the async endpoints
+    ASYNC_DB_POOL_SIZE: int = int(os.getenv("ASYNC_DB_POOL_SIZE", "10"))
+    ASYNC_DB_MAX_OVERFLOW: int = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "20"))
+
+    @model_validator(mode="after")
+    def check_chunking(self) -> "Settings":
+        if self.CHUNK_UNIT not in ("chars", "tokens"):
+            raise ValueError(f"CHUNK_UNIT must be 'chars' or 'tokens', got {self.CHUNK_UNIT!r}")
+        # Long chunks are split with a stride of CHUNK_SIZE - CHUNK_OVERLAP
+        if not 0 <= self.CHUNK_OVERLAP < self.CHUNK_SIZE:
+            raise ValueError(
+                f"CHUNK_OVERLAP must be >= 0 and smaller than CHUNK_SIZE "
+                f"(got CHUNK_OVERLAP={self.CHUNK_OVERLAP}, CHUNK_SIZE={self.CHUNK_SIZE})"
+            )
+        return self
+
     @property
     def DATABASE_URL(self) -> str:
         return (
@@ -25,5 +136,12 @@ class Settings(BaseModel):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
 
 settings = Settings()
@@ -1,4 +1,7 @@
+from typing import AsyncIterator, Optional
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 
 engine = create_engine(
@@ -7,6 +10,10 @@ engine = create_engine(
     pool_pre_ping=True, 
 )
 
+# Created on first use, so processes that never serve async endpoints
+# (ingestion workers, scripts) do not need the asyncpg driver
+_async_engine: Optional[AsyncEngine] = None
+
 
 def init_db():
     SQLModel.metadata.create_all(engine)
@@ -16,3 +23,32 @@ def init_db():
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL,
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=settings.ASYNC_DB_POOL_SIZE,
+            max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+        )
+    return _async_engine
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    # expire_on_commit=False: objects stay readable after commit without
+    # another round trip (lazy refreshes are not possible in async code)
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
@@ -1,3 +1,4 @@
+import inspect
 import logging
 import time
 from functools import wraps
@@ -55,6 +56,14 @@ def log_class_methods(level: str = "INFO"):
             if attr_name.startswith("_") or not callable(attr_value):
                 continue
 
+            if inspect.iscoroutinefunction(attr_value):
+                setattr(cls, attr_name, _wrap_coroutine(cls, attr_name, attr_value, level))
+                continue
+
+            if inspect.isgeneratorfunction(attr_value):
+                setattr(cls, attr_name, _wrap_generator(cls, attr_name, attr_value, level))
+                continue
+
             @wraps(attr_value)
             def wrapper(self, *args, __method=attr_value, __name=attr_name, **kwargs):
                 log_func = getattr(logger, level.lower(), logger.info)
@@ -86,3 +95,62 @@ def log_class_methods(level: str = "INFO"):
         return cls
 
     return decorator
+
+
+def _wrap_coroutine(cls, name: str, method, level: str):
+    """Async counterpart of the ``log_class_methods`` wrapper: times the awaited call."""
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        log_func = getattr(logger, level.lower(), logger.info)
+        func_name = f"{cls.__module__}.{cls.__name__}.{name}"
+
+        log_func(f"Executing: {func_name} args={args}, kwargs={kwargs}")
+        start_time = time.perf_counter()
+
+        try:
+            result = await method(self, *args, **kwargs)
+            elapsed = (time.perf_counter() - start_time) * 1000
+            log_func(f"{func_name} completed in {elapsed:.2f} ms")
+            return result
+
+        except Exception as e:
+            elapsed = (time.perf_counter() - start_time) * 1000
+            logger.exception(f"Error in {func_name} after {elapsed:.2f} ms: {e}")
+            raise
+
+    return wrapper
+
+
+def _wrap_generator(cls, name: str, method, level: str):
+    """
+    Generator counterpart of the ``log_class_methods`` wrapper: the body only
+    runs while the caller iterates, so the generator is timed until it is
+    exhausted and errors raised mid-stream are logged too.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        log_func = getattr(logger, level.lower(), logger.info)
+        func_name = f"{cls.__module__}.{cls.__name__}.{name}"
+
+        log_func(f"Executing: {func_name} args={args}, kwargs={kwargs}")
+        start_time = time.perf_counter()
+
+        try:
+            result = yield from method(self, *args, **kwargs)
+            elapsed = (time.perf_counter() - start_time) * 1000
+            log_func(f"{func_name} completed in {elapsed:.2f} ms")
+            return result
+
+        except GeneratorExit:
+            elapsed = (time.perf_counter() - start_time) * 1000
+            log_func(f"{func_name} closed by the caller after {elapsed:.2f} ms")
+            raise
+
+        except Exception as e:
+            elapsed = (time.perf_counter() - start_time) * 1000
+            logger.exception(f"Error in {func_name} after {elapsed:.2f} ms: {e}")
+            raise
+
+    return wrapper
@@ -0,0 +1,150 @@
+"""
+-------------------------------------------------------------------------
+Application-scoped clients shared by every request and background worker.
+
+A single Resources container is created in the FastAPI lifespan and stored
+on ``app.state.resources``; endpoints receive it through ``get_resources``.
+Clients are built on first use (keeping startup fast) and then reused, so
+requests share one HTTP connection pool instead of paying a TLS handshake,
+an OAuth token load or a Drive discovery build each time. Async endpoints
+get their own pool (``async_http_client``), used by ``async_openai`` and the
+async methods of ``embeddings``.
+-------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+from fastapi import Request
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
+    from app.domain.drive.service import DriveService
+
+logger = logging.getLogger("app")
+
+
+class Resources:
+    """Lazily created, thread-safe holder of the shared API clients."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Separate lock: the first Drive use may wait on an interactive OAuth flow
+        self._drive_lock = threading.Lock()
+        self._http_client: httpx.Client | None = None
+        self._openai: OpenAI | None = None
+        self._async_http_client: httpx.AsyncClient | None = None
+        self._async_openai: AsyncOpenAI | None = None
+        self._embeddings: Any = None
+        self._drive: DriveService | None = None
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Connection pool shared by the OpenAI SDK and the LangChain clients."""
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+
+                self._http_client = httpx.Client(
+                    timeout=settings.OPENAI_TIMEOUT, limits=_http_limits()
+                )
+            return self._http_client
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        """Connection pool of the async OpenAI and LangChain clients."""
+        with self._lock:
+            if self._async_http_client is None:
+                import httpx
+
+                self._async_http_client = httpx.AsyncClient(
+                    timeout=settings.OPENAI_TIMEOUT, limits=_http_limits()
+                )
+            return self._async_http_client
+
+    @property
+    def openai(self) -> OpenAI:
+        """OpenAI SDK client used for chat completions."""
+        http_client = self.http_client
+        with self._lock:
+            if self._openai is None:
+                from openai import OpenAI
+
+                self._openai = OpenAI(
+                    http_client=http_client, timeout=settings.OPENAI_TIMEOUT
+                )
+            return self._openai
+
+    @property
+    def async_openai(self) -> AsyncOpenAI:
+        """Async OpenAI SDK client used by the async endpoints."""
+        http_client = self.async_http_client
+        with self._lock:
+            if self._async_openai is None:
+                from openai import AsyncOpenAI
+
+                self._async_openai = AsyncOpenAI(
+                    http_client=http_client, timeout=settings.OPENAI_TIMEOUT
+                )
+            return self._async_openai
+
+    @property
+    def embeddings(self) -> Any:
+        """LangChain ``OpenAIEmbeddings`` client (sync and async methods)."""
+        http_client = self.http_client
+        async_http_client = self.async_http_client
+        with self._lock:
+            if self._embeddings is None:
+                from langchain_openai import OpenAIEmbeddings
+
+                self._embeddings = OpenAIEmbeddings(
+                    http_client=http_client,
+                    http_async_client=async_http_client,
+                    request_timeout=settings.OPENAI_TIMEOUT,
+                )
+            return self._embeddings
+
+    @property
+    def drive(self) -> DriveService:
+        """Google Drive client (OAuth token loaded once)."""
+        with self._drive_lock:
+            if self._drive is None:
+                from app.domain.drive.service import DriveService
+
+                self._drive = DriveService()
+            return self._drive
+
+    def close(self) -> None:
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = self._openai = self._embeddings = self._drive = None
+        logger.info("Shared clients closed")
+
+    async def aclose(self) -> None:
+        """Closes the async pool too; call from the event loop that used it."""
+        with self._lock:
+            async_http_client = self._async_http_client
+            self._async_http_client = self._async_openai = None
+        if async_http_client is not None:
+            await async_http_client.aclose()
+        self.close()
+
+
+def _http_limits() -> httpx.Limits:
+    import httpx
+
+    return httpx.Limits(
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+    )
+
+
+def get_resources(request: Request) -> Resources:
+    """FastAPI dependency returning the container created in the lifespan."""
+    return request.app.state.resources
@@ -0,0 +1,106 @@
+"""
+-------------------------------------------------------------------------
+Async variant of the chat question answering pipeline.
+
+Every slow step of ``ChatService.ask`` is awaited instead of blocking a
+thread: the question embedding and the completion go through the async
+OpenAI clients, and the database work runs on an ``AsyncSession``. The
+synchronous repositories are reused through ``AsyncSession.run_sync``,
+which drives them over the async connection. Retrieval is the exception:
+run_sync executes on the event loop thread, and decoding, building and
+scoring embedding matrices is CPU work, so the search runs in a worker
+thread with its own synchronous session instead.
+
+No transaction (and so no pooled connection) is held open while waiting
+on OpenAI, so the number of in-flight questions is bounded by the OpenAI
+connection pool rather than by the database pool or a thread pool; only
+the short retrieval step borrows a thread.
+-------------------------------------------------------------------------
+"""
+
+import asyncio
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import engine
+from app.core.logging_decorator import log_class_methods
+from app.core.resources import Resources
+from app.domain.document.retrieval_service import RetrievalService
+from app.domain.message.models import Message
+from app.domain.message.schemas import MessageCreate
+from app.domain.message.service import MessageService
+from app.domain.rag.embedding_service import EmbeddingService
+from app.utils.prompts import rag_prompt
+from .repository import ChatRepository
+from .service import build_context
+
+
+@log_class_methods("DEBUG")
+class AsyncChatService:
+    """Answers chat questions without blocking the event loop."""
+
+    def __init__(self, session: AsyncSession, resources: Resources):
+        self.session = session
+        self.embedding_service = EmbeddingService(resources.embeddings)
+        self.client = resources.async_openai
+        self.model = "gpt-4o-mini"
+
+    async def ask(self, chat_id: int, question: str, top_k: int = 5) -> Message:
+        """
+        Handles a user's question within a chat, retrieves relevant chunks
+        from associated documents, and generates a contextual answer.
+        """
+
+        # Save the user message
+        await self._save_message(chat_id, "user", question)
+
+        # Get the chat and its linked documents
+        chat = await self.session.run_sync(
+            lambda session: ChatRepository(session).get_by_id(chat_id)
+        )
+        # End the read transaction: no connection is held during API calls
+        await self.session.commit()
+        if not chat or not chat.document_ids:
+            return await self._save_message(
+                chat_id, "assistant", "No documents are linked to this chat."
+            )
+
+        # Generate embedding for the question
+        query_embedding = await self.embedding_service.aembed_text(question)
+
+        # Retrieve the most similar chunks of the linked documents, off the loop
+        top_chunks = await asyncio.to_thread(
+            _search, chat.document_ids, query_embedding, top_k
+        )
+        if not top_chunks:
+            return await self._save_message(
+                chat_id, "assistant", "No content found for the selected documents."
+            )
+
+        # Generate and save assistant's answer
+        context = build_context([chunk for _, chunk in top_chunks])
+        answer_text = await self._generate_answer(question, context)
+        return await self._save_message(chat_id, "assistant", answer_text)
+
+    async def _save_message(self, chat_id: int, sender: str, content: str) -> Message:
+        data = MessageCreate(chat_id=chat_id, sender=sender, content=content)
+        return await self.session.run_sync(
+            lambda session: MessageService(session).create(data)
+        )
+
+    async def _generate_answer(self, question: str, context: str) -> str:
+        """Generate final answer from GPT using contextual information."""
+        prompt = rag_prompt(context, question)
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return response.choices[0].message.content.strip()
+
+
+def _search(
+    document_ids: list[int], query_embedding: list[float], top_k: int
+) -> list[tuple[float, str]]:
+    with Session(engine) as session:
+        return RetrievalService(session).search(document_ids, query_embedding, top_k)
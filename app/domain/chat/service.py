@@ -1,23 +1,45 @@
-from typing import List
+from typing import Iterator, List
 from fastapi import HTTPException
 from sqlmodel import Session, select
-from openai import OpenAI
 
+from app.core.config import settings
 from app.core.logging_decorator import log_class_methods
+from app.core.resources import Resources
 from app.domain.document.models import DocumentChunk
 from app.domain.document.repository import DocumentRepository
+from app.domain.document.retrieval_service import RetrievalService
 from app.domain.message.schemas import MessageCreate
 from app.domain.message.service import MessageService
 from app.domain.rag.embedding_service import EmbeddingService
 from app.domain.user.repository import UserRepository
 from app.domain.message.models import Message
 from app.utils.prompts import rag_prompt
-from app.utils.similiraty import cosine_similarity
+from app.utils.tokens import count_tokens, truncate_to_tokens
 from .models import Chat
 from .repository import ChatRepository
 from .schemas import ChatCreate
 
 
+def build_context(chunks: List[str]) -> str:
+    """
+    Packs the retrieved chunks, best first, into CHAT_CONTEXT_MAX_TOKENS
+    tokens. Chunks that do not fit are skipped; the best chunk is
+    truncated rather than dropped.
+    """
+    separator = "\n\n"
+    budget = settings.CHAT_CONTEXT_MAX_TOKENS
+    parts: List[str] = []
+    for chunk in chunks:
+        cost = count_tokens(chunk) + (count_tokens(separator) if parts else 0)
+        if cost <= budget:
+            parts.append(chunk)
+            budget -= cost
+        elif not parts:
+            parts.append(truncate_to_tokens(chunk, budget))
+            budget = 0
+    return separator.join(parts)
+
+
 @log_class_methods("DEBUG")
 class ChatService:
     """
@@ -25,13 +47,14 @@ class ChatService:
     and RAG question answering over selected documents.
     """
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, resources: Resources):
         self.session = session
         self.repo = ChatRepository(session)
         self.message_service = MessageService(session)
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = EmbeddingService(resources.embeddings)
         self.document_repo = DocumentRepository(session)
-        self.client = OpenAI()
+        self.retrieval_service = RetrievalService(session)
+        self.client = resources.openai
         self.model = "gpt-4o-mini"
 
     def list_with_total(self, offset: int, limit: int) -> tuple[list[Chat], int]:
@@ -54,6 +77,42 @@ class ChatService:
         Handles a user's question within a chat, retrieves relevant chunks
         from associated documents, and generates a contextual answer.
         """
+        reply, context = self._prepare_answer(chat_id, question, top_k)
+        if reply:
+            return reply
+
+        # Generate and save assistant's answer
+        answer_text = self._generate_answer(question, context)
+        return self._save_answer(chat_id, answer_text)
+
+    def ask_stream(
+        self, chat_id: int, question: str, top_k: int = 5
+    ) -> Iterator[str | Message]:
+        """
+        Streaming variant of ``ask``: yields the answer text deltas as soon as
+        the model produces them, then the persisted assistant Message once
+        the completion has finished.
+        """
+        reply, context = self._prepare_answer(chat_id, question, top_k)
+        if reply:
+            yield reply.content
+            yield reply
+            return
+
+        parts: List[str] = []
+        for delta in self._stream_answer(question, context):
+            parts.append(delta)
+            yield delta
+        yield self._save_answer(chat_id, "".join(parts).strip())
+
+    def _prepare_answer(
+        self, chat_id: int, question: str, top_k: int
+    ) -> tuple[Message | None, str]:
+        """
+        Saves the user message and retrieves the context for the answer.
+        Returns ``(reply, context)``; ``reply`` is an already saved assistant
+        message when there is nothing to answer from.
+        """
 
         # Save the user message
         user_msg = MessageCreate(chat_id=chat_id, sender="user", content=question)
@@ -62,53 +121,27 @@ class ChatService:
         # Get the chat and its linked documents
         chat = self.repo.get_by_id(chat_id)
         if not chat or not chat.document_ids:
-            return self.message_service.create(
-                MessageCreate(
-                    chat_id=chat_id,
-                    sender="assistant",
-                    content="No documents are linked to this chat.",
-                )
-            )
+            return self._save_answer(chat_id, "No documents are linked to this chat."), ""
 
         # Generate embedding for the question
         query_embedding = self.embedding_service.embed_text(question)
 
-        # Retrieve document chunks using document_id
-        chunks = self.document_repo.get_chunks_by_documents(chat.document_ids)
-        if not chunks:
-            return self.message_service.create(
-                MessageCreate(
-                    chat_id=chat_id,
-                    sender="assistant",
-                    content="No content found for the selected documents.",
-                )
-    )
-
-        if not chunks:
-            return self.message_service.create(
-                MessageCreate(
-                    chat_id=chat_id,
-                    sender="assistant",
-                    content="No content found for the selected documents.",
-                )
+        # Retrieve the most similar chunks of the linked documents
+        top_chunks = self.retrieval_service.search(
+            chat.document_ids, query_embedding, top_k
+        )
+        if not top_chunks:
+            return (
+                self._save_answer(chat_id, "No content found for the selected documents."),
+                "",
             )
 
-        # Compute similarity between the question and each chunk
-        scored_chunks = [
-            (cosine_similarity(query_embedding, c.embedding), c.content)
-            for c in chunks
-            if c.embedding
-        ]
-        top_chunks = sorted(scored_chunks, key=lambda x: x[0], reverse=True)[:top_k]
-        context = "\n\n".join([chunk for _, chunk in top_chunks])
-
-        # Generate and save assistant's answer
-        answer_text = self._generate_answer(question, context)
+        return None, build_context([chunk for _, chunk in top_chunks])
 
-        chat_msg = MessageCreate(
-            chat_id=chat_id, sender="assistant", content=answer_text
+    def _save_answer(self, chat_id: int, content: str) -> Message:
+        return self.message_service.create(
+            MessageCreate(chat_id=chat_id, sender="assistant", content=content)
         )
-        return self.message_service.create(chat_msg)
 
     def _generate_answer(self, question: str, context: str) -> str:
         """Generate final answer from GPT using contextual information."""
@@ -118,3 +151,19 @@ class ChatService:
             messages=[{"role": "user", "content": prompt}],
         )
         return response.choices[0].message.content.strip()
+
+    def _stream_answer(self, question: str, context: str) -> Iterator[str]:
+        """Streams the answer from GPT, yielding text deltas as they arrive."""
+        prompt = rag_prompt(context, question)
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        )
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Stops generation (and frees the connection) if the client went away
+            stream.close()
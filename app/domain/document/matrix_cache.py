@@ -0,0 +1,111 @@
+"""
+-------------------------------------------------------------------------
+In-process LRU cache of per-document embedding matrices.
+-------------------------------------------------------------------------
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+
+@dataclass(frozen=True)
+class DocumentMatrix:
+    """
+    Row-normalized float32 embedding matrix of one document plus its chunk ids.
+    ``version`` is the ``(chunk count, max chunk id)`` the matrix was built from.
+    """
+
+    chunk_ids: np.ndarray
+    matrix: np.ndarray
+    version: tuple[int, int] = (0, 0)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.chunk_ids.nbytes + self.matrix.nbytes)
+
+
+class EmbeddingMatrixCache:
+    """
+    Bounded, memory-accounted LRU cache keyed by ``document_id``.
+
+    Entries are evicted least-recently-used first whenever the total size of
+    the cached arrays exceeds ``max_bytes``. A single entry larger than the
+    budget is never cached. All operations are thread-safe, since sync
+    endpoints run in FastAPI's threadpool.
+
+    ``invalidate`` only reaches this process, so readers also pass the current
+    chunk version of the document to ``get``, and entries built from other
+    chunks are dropped (see ``RetrievalService.get_matrices``).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, DocumentMatrix]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, document_id: int, version: tuple[int, int] | None = None
+    ) -> DocumentMatrix | None:
+        """Returns the cached entry, unless it was built from another ``version``."""
+        with self._lock:
+            entry = self._entries.get(document_id)
+            if entry is not None and version is not None and entry.version != version:
+                self._discard(document_id)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(document_id)
+            self.hits += 1
+            return entry
+
+    def put(self, document_id: int, entry: DocumentMatrix) -> None:
+        # Empty matrices are not cached: chunks may just not be committed yet
+        if not len(entry.chunk_ids) or entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(document_id)
+            self._entries[document_id] = entry
+            self._size += entry.nbytes
+            while self._size > self.max_bytes:
+                evicted_id, _ = next(iter(self._entries.items()))
+                self._discard(evicted_id)
+                logger.debug(f"Evicted embedding matrix of document {evicted_id}")
+
+    def invalidate(self, document_id: int) -> None:
+        with self._lock:
+            self._discard(document_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _discard(self, document_id: int) -> None:
+        entry = self._entries.pop(document_id, None)
+        if entry is not None:
+            self._size -= entry.nbytes
+
+
+matrix_cache = EmbeddingMatrixCache(settings.EMBEDDING_CACHE_MAX_MB * 1024 * 1024)
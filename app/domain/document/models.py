@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional, List
-from sqlmodel import JSON, Column, SQLModel, Field, Relationship
+from sqlalchemy import LargeBinary
+from sqlmodel import Column, SQLModel, Field, Relationship
 
 
 class Document(SQLModel, table=True):
@@ -48,10 +49,13 @@ class DocumentChunk(SQLModel, table=True):
         description="Reference to the parent document",
     )
     content: str = Field(nullable=False, description="Text content of the chunk")
-    embedding: list[float] | None = Field(
+    content_hash: Optional[str] = Field(
+        default=None, description="SHA-256 of the chunk content, used for re-indexing"
+    )
+    embedding: bytes | None = Field(
         default=None,
-        sa_column=Column(JSON),
-        description="Embedding vector generated from the chunk",
+        sa_column=Column(LargeBinary),
+        description="Binary-encoded embedding vector (see app.utils.embedding_codec)",
     )
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
@@ -1,9 +1,81 @@
+import csv
+import io
+import json
 from ast import List
+from datetime import datetime, timezone
 from typing import Sequence, Optional, Any
 from sqlmodel import Session, select
-from sqlalchemy import func
+from sqlalchemy import (
+    LargeBinary,
+    bindparam,
+    column,
+    delete,
+    func,
+    insert,
+    inspect,
+    table,
+    text,
+)
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.utils.embedding_codec import encode_embedding
+from app.utils.hashing import sha256_text
 from .models import Document, DocumentChunk
 
+# Core view of document_chunk for bulk writes; embedding_vector only exists
+# after the pgvector migration and is therefore not part of the ORM model.
+_chunk_table = table(
+    "document_chunk",
+    column("document_id"),
+    column("content"),
+    column("content_hash"),
+    column("embedding", LargeBinary),
+    column("created_at"),
+    column("embedding_vector"),
+)
+
+# First key of the advisory locks taken by ``lock_for_ingestion``
+_INGESTION_LOCK_NAMESPACE = 1
+
+# Per database URL: whether document_chunk.embedding_vector exists, and the
+# installed pgvector version (both only change with a migration)
+_vector_columns: dict[str, bool] = {}
+_pgvector_versions: dict[str, tuple[int, ...]] = {}
+
+
+def has_vector_column(bind: Engine) -> bool:
+    """Whether the pgvector migration created ``document_chunk.embedding_vector``."""
+    key = str(bind.url)
+    if key not in _vector_columns:
+        columns = inspect(bind).get_columns("document_chunk")
+        _vector_columns[key] = any(c["name"] == "embedding_vector" for c in columns)
+    return _vector_columns[key]
+
+
+def check_vector_backend(bind: Engine) -> None:
+    """
+    Fails fast when ``VECTOR_BACKEND=pgvector`` is selected on a database
+    without the ``embedding_vector`` column (the pgvector migration is a
+    no-op where the extension is not available).
+    """
+    if settings.VECTOR_BACKEND == "pgvector" and not has_vector_column(bind):
+        raise RuntimeError(
+            "VECTOR_BACKEND=pgvector needs the document_chunk.embedding_vector column: "
+            "run `alembic upgrade head` on a Postgres server with the vector "
+            "extension, or use VECTOR_BACKEND=python"
+        )
+
+
+def _pgvector_version(bind: Engine, connection) -> tuple[int, ...]:
+    key = str(bind.url)
+    if key not in _pgvector_versions:
+        version = connection.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        ).scalar()
+        _pgvector_versions[key] = tuple(int(p) for p in (version or "0").split("."))
+    return _pgvector_versions[key]
+
 
 class DocumentRepository:
     def __init__(self, session: Session):
@@ -52,10 +124,251 @@ class DocumentRepository:
     def get_chunks_by_documents(self, document_ids: list[int]) -> list[DocumentChunk]:
         """
         Retrieve all chunks belonging to the given list of documents.
-        Used by ChatService for contextual question answering.
+        Retrieval scores on ``get_chunk_vectors`` instead, which skips the text.
         """
         if not document_ids:
             return []
 
         stmt = select(DocumentChunk).where(DocumentChunk.document_id.in_(document_ids))
         return self.session.exec(stmt).all()
+
+    def get_chunk_vectors(
+        self, document_ids: list[int]
+    ) -> Sequence[tuple[int, int, bytes]]:
+        """
+        Retrieve only ``(id, document_id, embedding)`` for the chunks of the
+        given documents, so scoring never transfers chunk text or timestamps.
+        """
+        if not document_ids:
+            return []
+
+        stmt = (
+            select(DocumentChunk.id, DocumentChunk.document_id, DocumentChunk.embedding)
+            .where(DocumentChunk.document_id.in_(document_ids))
+            .where(DocumentChunk.embedding.is_not(None))
+            .order_by(DocumentChunk.id)
+        )
+        return self.session.exec(stmt).all()
+
+    def get_chunk_versions(self, document_ids: list[int]) -> dict[int, tuple[int, int]]:
+        """
+        Returns ``(chunk count, max chunk id)`` of each document with embedded
+        chunks. Ids only grow, so the pair changes whenever chunks are added or
+        removed; documents without chunks are absent from the result.
+        """
+        if not document_ids:
+            return {}
+
+        stmt = (
+            select(
+                DocumentChunk.document_id,
+                func.count(DocumentChunk.id),
+                func.max(DocumentChunk.id),
+            )
+            .where(DocumentChunk.document_id.in_(document_ids))
+            .where(DocumentChunk.embedding.is_not(None))
+            .group_by(DocumentChunk.document_id)
+        )
+        return {
+            document_id: (count, max_id)
+            for document_id, count, max_id in self.session.exec(stmt).all()
+        }
+
+    def get_chunk_contents(self, chunk_ids: list[int]) -> dict[int, str]:
+        """Return the text content of the given chunks, keyed by chunk id."""
+        if not chunk_ids:
+            return {}
+
+        stmt = select(DocumentChunk.id, DocumentChunk.content).where(
+            DocumentChunk.id.in_(chunk_ids)
+        )
+        return {chunk_id: content for chunk_id, content in self.session.exec(stmt)}
+
+    def get_chunk_hashes(self, document_id: int) -> Sequence[tuple[int, str | None]]:
+        """Retrieve ``(id, content_hash)`` of every chunk of the document."""
+        stmt = (
+            select(DocumentChunk.id, DocumentChunk.content_hash)
+            .where(DocumentChunk.document_id == document_id)
+            .order_by(DocumentChunk.id)
+        )
+        return self.session.exec(stmt).all()
+
+    def lock_for_ingestion(self, document_id: int) -> None:
+        """
+        Serializes ingestion jobs of a document until the current transaction
+        ends, so two jobs never diff and insert the same chunks concurrently.
+        A transaction-scoped advisory lock is used instead of ``FOR UPDATE`` on
+        the document row, which would block edits of the document for the
+        whole job. SQLite (local runs) already serializes writers.
+        """
+        if self.session.get_bind().dialect.name != "postgresql":
+            return
+        self.session.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :document_id)"),
+            {"namespace": _INGESTION_LOCK_NAMESPACE, "document_id": document_id},
+        )
+
+    def delete_chunks(self, chunk_ids: list[int]) -> None:
+        """Deletes the given chunks. The caller is responsible for committing."""
+        for start in range(0, len(chunk_ids), settings.CHUNK_INSERT_BATCH_SIZE):
+            batch = chunk_ids[start : start + settings.CHUNK_INSERT_BATCH_SIZE]
+            self.session.execute(delete(DocumentChunk).where(DocumentChunk.id.in_(batch)))
+
+    def bulk_insert_chunks(
+        self,
+        document_id: int,
+        contents: list[str],
+        embeddings: list[list[float]],
+        batch_size: int | None = None,
+        use_copy: bool | None = None,
+    ) -> int:
+        """
+        Inserts chunks without building ORM objects, in batches of
+        ``batch_size`` rows: one Core ``INSERT`` executemany per batch, or a
+        Postgres ``COPY`` when ``use_copy`` is enabled and psycopg2 is used.
+        The caller is responsible for committing.
+
+        Returns:
+            int: Number of inserted chunks.
+        """
+        batch_size = batch_size or settings.CHUNK_INSERT_BATCH_SIZE
+        if use_copy is None:
+            use_copy = settings.CHUNK_INSERT_USE_COPY
+        bind = self.session.get_bind()
+        use_copy = use_copy and bind.dialect.driver == "psycopg2"
+        # Filled whatever the backend, so switching to pgvector later finds
+        # every chunk already indexed
+        with_vector = has_vector_column(bind)
+
+        created_at = datetime.now(timezone.utc)
+        rows = (
+            {
+                "document_id": document_id,
+                "content": content,
+                "content_hash": sha256_text(content),
+                "embedding": encode_embedding(
+                    embedding, settings.EMBEDDING_STORAGE_FORMAT
+                ),
+                "created_at": created_at,
+                **({"embedding_vector": json.dumps(embedding)} if with_vector else {}),
+            }
+            for content, embedding in zip(contents, embeddings)
+        )
+
+        inserted = 0
+        batch: list[dict] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                inserted += self._write_chunk_batch(batch, use_copy)
+                batch = []
+        if batch:
+            inserted += self._write_chunk_batch(batch, use_copy)
+        return inserted
+
+    def _write_chunk_batch(self, batch: list[dict], use_copy: bool) -> int:
+        if not use_copy:
+            self.session.execute(insert(_chunk_table), batch)
+            return len(batch)
+
+        columns = list(batch[0].keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow(
+                "\\x" + value.hex() if isinstance(value, bytes) else value
+                for value in (row[c] for c in columns)
+            )
+        buffer.seek(0)
+
+        # COPY runs on the session's own connection, inside its transaction
+        cursor = self.session.connection().connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY document_chunk ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+        return len(batch)
+
+    # ------------------------------------------------------------------
+    # pgvector backend (column created by the pgvector migration only,
+    # so it is addressed with plain SQL instead of the ORM model)
+    # ------------------------------------------------------------------
+
+    def search_chunks_by_vector(
+        self, document_ids: list[int], query_embedding: list[float], top_k: int
+    ) -> list[tuple[float, str]]:
+        """
+        Top-k cosine search executed by Postgres over the indexed
+        ``embedding_vector`` column, restricted to the given documents.
+
+        The document filter is applied to the rows the ANN index returns, so
+        a chat over a small share of the corpus could get fewer than
+        ``top_k`` rows from a single index pass; see ``_widen_vector_scan``.
+        """
+        if not document_ids:
+            return []
+
+        self._widen_vector_scan(top_k)
+        # Iterative scans may return rows slightly out of order: re-sort them
+        stmt = text(
+            """
+            WITH candidates AS MATERIALIZED (
+                SELECT embedding_vector <=> CAST(:query AS vector) AS distance, content
+                FROM document_chunk
+                WHERE document_id IN :document_ids AND embedding_vector IS NOT NULL
+                ORDER BY embedding_vector <=> CAST(:query AS vector)
+                LIMIT :top_k
+            )
+            SELECT 1 - distance AS score, content FROM candidates ORDER BY distance
+            """
+        ).bindparams(bindparam("document_ids", expanding=True))
+        rows = self.session.execute(
+            stmt,
+            {
+                "query": json.dumps(query_embedding),
+                "document_ids": list(document_ids),
+                "top_k": top_k,
+            },
+        )
+        return [(float(score), content) for score, content in rows]
+
+    def _widen_vector_scan(self, top_k: int) -> None:
+        """
+        Lets the ANN index keep scanning until ``top_k`` rows pass the filter,
+        for the current transaction only: iterative index scans on pgvector
+        0.8+, otherwise a larger HNSW candidate list (``PGVECTOR_EF_SEARCH``).
+        """
+        connection = self.session.connection()
+        if _pgvector_version(self.session.get_bind(), connection) >= (0, 8):
+            connection.execute(
+                text(
+                    "SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true), "
+                    "set_config('ivfflat.iterative_scan', 'relaxed_order', true)"
+                )
+            )
+        else:
+            ef_search = min(max(settings.PGVECTOR_EF_SEARCH, top_k), 1000)
+            connection.execute(
+                text("SELECT set_config('hnsw.ef_search', :value, true)"),
+                {"value": str(ef_search)},
+            )
+
+    def store_chunk_vectors(self, vectors: list[tuple[int, list[float]]]) -> None:
+        """
+        Writes ``(chunk_id, embedding)`` pairs into ``embedding_vector``.
+        The caller is responsible for committing.
+        """
+        if not vectors:
+            return
+
+        stmt = text(
+            "UPDATE document_chunk SET embedding_vector = CAST(:vector AS vector) "
+            "WHERE id = :id"
+        )
+        self.session.execute(
+            stmt,
+            [{"id": chunk_id, "vector": json.dumps(vec)} for chunk_id, vec in vectors],
+        )
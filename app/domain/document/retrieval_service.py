@@ -0,0 +1,119 @@
+from collections import defaultdict
+
+import numpy as np
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.utils.embedding_codec import decode_embedding
+from app.utils.vector_search import build_matrix, top_k as top_k_rows
+from .matrix_cache import DocumentMatrix, matrix_cache
+from .repository import DocumentRepository
+
+
+class RetrievalService:
+    """
+    Top-k chunk retrieval over the embedding matrices of a set of documents.
+
+    With the default "python" backend, matrices are served from the
+    in-process ``matrix_cache`` and only the documents missing from it, or
+    whose chunks changed since they were cached, are loaded from the
+    database. With ``VECTOR_BACKEND=pgvector`` the search is pushed into SQL
+    over the ANN-indexed ``embedding_vector`` column.
+    """
+
+    def __init__(self, session: Session):
+        self.repo = DocumentRepository(session)
+        self.cache = matrix_cache
+
+    def search(
+        self, document_ids: list[int], query_embedding: list[float], top_k: int = 5
+    ) -> list[tuple[float, str]]:
+        """
+        Returns the ``top_k`` most similar chunks as ``(score, content)`` pairs,
+        best first. Only the winning chunks have their text loaded.
+        """
+        if settings.VECTOR_BACKEND == "pgvector":
+            return self.repo.search_chunks_by_vector(
+                document_ids, query_embedding, top_k
+            )
+
+        matrices = self.get_matrices(document_ids)
+
+        # Best candidates of every document, then the global top-k among them
+        candidate_ids, candidate_scores = [], []
+        for entry in matrices:
+            rows, scores = top_k_rows(entry.matrix, query_embedding, top_k)
+            candidate_ids.append(entry.chunk_ids[rows])
+            candidate_scores.append(scores)
+        if not candidate_ids:
+            return []
+
+        ids = np.concatenate(candidate_ids)
+        scores = np.concatenate(candidate_scores)
+        best = np.argsort(scores)[::-1][:top_k]
+
+        contents = self.repo.get_chunk_contents([int(i) for i in ids[best]])
+        return [
+            (float(scores[i]), contents[int(ids[i])])
+            for i in best
+            if int(ids[i]) in contents
+        ]
+
+    def get_matrices(self, document_ids: list[int]) -> list[DocumentMatrix]:
+        """
+        Returns the non-empty embedding matrices of the given documents.
+
+        Cached entries are checked against the current chunk version of their
+        document, so changes made by another process (a standalone worker or
+        another API worker) are picked up even though its ``invalidate`` call
+        never reached this cache.
+        """
+        versions = self.repo.get_chunk_versions(list(dict.fromkeys(document_ids)))
+        matrices: dict[int, DocumentMatrix] = {}
+        missing: list[int] = []
+        for document_id in dict.fromkeys(document_ids):
+            if document_id not in versions:
+                # No embedded chunks (yet)
+                self.cache.invalidate(document_id)
+                continue
+            entry = self.cache.get(document_id, versions[document_id])
+            if entry is None:
+                missing.append(document_id)
+            else:
+                matrices[document_id] = entry
+
+        for document_id, entry in self._load_matrices(missing).items():
+            self.cache.put(document_id, entry)
+            matrices[document_id] = entry
+
+        return [m for m in matrices.values() if len(m.chunk_ids)]
+
+    def _load_matrices(self, document_ids: list[int]) -> dict[int, DocumentMatrix]:
+        """
+        Loads and normalizes the embeddings of the given documents from the DB.
+        Only ids and vectors are fetched; chunk text is loaded later for the
+        winning chunks only (see ``search``).
+        """
+        if not document_ids:
+            return {}
+
+        grouped: dict[int, tuple[list[int], list[np.ndarray]]] = defaultdict(
+            lambda: ([], [])
+        )
+        for chunk_id, document_id, embedding in self.repo.get_chunk_vectors(
+            document_ids
+        ):
+            ids, vectors = grouped[document_id]
+            ids.append(chunk_id)
+            vectors.append(decode_embedding(embedding))
+
+        matrices = {}
+        for document_id in document_ids:
+            ids, vectors = grouped.get(document_id, ([], []))
+            matrices[document_id] = DocumentMatrix(
+                chunk_ids=np.asarray(ids, dtype=np.int64),
+                matrix=build_matrix(vectors),
+                # Version of the rows actually loaded (ids are ordered)
+                version=(len(ids), ids[-1] if ids else 0),
+            )
+        return matrices
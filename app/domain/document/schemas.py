@@ -21,6 +21,10 @@ class DocumentRead(DocumentBase):
     updated_at: datetime
 
 
+class DocumentUploadRead(DocumentRead):
+    job_id: int
+
+
 class DocumentUpdate(SQLModel):
     title: Optional[str] = None
     description: Optional[str] = None
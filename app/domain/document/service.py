@@ -1,20 +1,31 @@
-from typing import List, Optional, Any
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Any
 from sqlmodel import Session
 
+from app.core.config import settings
+from app.core.resources import Resources
+from app.domain.job.models import IngestionJob
+from app.domain.job.repository import IngestionJobRepository
 from app.domain.rag.embedding_service import EmbeddingService
-from app.utils.chunking import split_text_semantic
-from app.utils.file_loader import load_text
-from .models import Document, DocumentChunk
+from app.utils.chunking import iter_chunks_semantic
+from app.utils.extraction_executor import get_extraction_executor
+from app.utils.hashing import sha256_text
+from .matrix_cache import matrix_cache
+from .models import Document
 from .repository import DocumentRepository
 from .schemas import DocumentCreate, DocumentUpdate
 
+logger = logging.getLogger("app")
+
 
 class DocumentService:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, resources: Resources):
         self.session = session
         self.repo = DocumentRepository(session)
-        self.embedding_service = EmbeddingService()
-
+        self.job_repo = IngestionJobRepository(session)
+        self.embedding_service = EmbeddingService(resources.embeddings)
 
     def list_with_total(
         self, offset: int, limit: int, filters: dict[str, Any] | None = None
@@ -26,37 +37,161 @@ class DocumentService:
         total = self.repo.count()
         return items, total
 
-    def create(self, data: DocumentCreate) -> Document:
+    def get(self, id: int) -> Optional[Document]:
+        return self.repo.get(id)
+
+    def create(self, data: DocumentCreate) -> tuple[Document, IngestionJob]:
         """
-        Creates a new document, automatically extracts its content,
-        splits it into semantic chunks, and generates embeddings for each chunk.
+        Creates a new document and enqueues its ingestion job. Extraction,
+        chunking and embedding run later in a background worker (see ``ingest``).
         """
-
-        # Create and persist the main Document record
         document = Document.model_validate(data.model_dump())
         self.session.add(document)
+        self.session.flush()
+
+        job = self.job_repo.add(IngestionJob(document_id=document.id))
         self.session.commit()
         self.session.refresh(document)
+        self.session.refresh(job)
+        return document, job
+
+    def get_status(self, id: int) -> Optional[IngestionJob]:
+        """Returns the latest ingestion job of the document."""
+        return self.job_repo.get_latest_for_document(id)
+
+    def ingest(
+        self, id: int, on_progress: Callable[[str, int], None] | None = None
+    ) -> Document:
+        """
+        Extracts the content of an existing document, splits it into semantic
+        chunks, and generates and stores embeddings for each chunk.
+
+        Args:
+            id (int): Document identifier.
+            on_progress (Callable): Called as ``(stage, percent)`` while running.
+        """
+        report = on_progress or (lambda stage, percent: None)
+
+        # One job per document at a time (held until the final commit)
+        self.repo.lock_for_ingestion(id)
+        document = self.repo.get(id)
+        if not document:
+            raise ValueError(f"Document {id} not found")
 
         # Load the raw document content (supports .txt, .pdf, .docx, .md, or URL)
-        text = load_text(document.source)
+        report("extracting", 0)
+        pages = get_extraction_executor().extract_pages(document.source)
 
         # Split the content into semantic chunks with overlap
-        chunks = split_text_semantic(text, chunk_size=800, overlap=150)
+        report("chunking", 10)
+        chunks = _chunk_pages(pages)
 
-        # Generate embeddings and store each chunk in the database
-        for chunk_text in chunks:
-            embedding = self.embedding_service.embed_text(chunk_text)
-            chunk = DocumentChunk(
-                document_id=document.id,
-                content=chunk_text,
-                embedding=embedding,
-            )
-            self.session.add(chunk)
+        # Generate embeddings in batches (20% -> 90% of the progress)
+        report("embedding", 20)
+        embeddings = self.embedding_service.embed_texts(
+            chunks,
+            on_progress=lambda done, total: report("embedding", 20 + 70 * done // total),
+        )
+
+        # Bulk insert the chunks (and their native vectors when enabled)
+        report("storing", 90)
+        self.repo.bulk_insert_chunks(document.id, chunks, embeddings)
 
         # Commit all inserted chunks and refresh the document
         self.session.commit()
         self.session.refresh(document)
+        matrix_cache.invalidate(document.id)
+
+        return document
+
+    def enqueue_reindex(
+        self, id: int, source: Optional[str] = None
+    ) -> Optional[IngestionJob]:
+        """
+        Enqueues a re-index job for an existing document (see ``reindex``).
+        If a job of the document is still pending, that job is returned
+        instead: it reads the (possibly replaced) source when it runs.
+
+        Args:
+            id (int): Document identifier.
+            source (str): New file of the document, replacing the current one.
+        """
+        document = self.repo.get(id)
+        if not document:
+            return None
+        if source is not None and source != document.source:
+            document.source = source
+            self.session.add(document)
+        job = self.job_repo.get_pending_for_document(id)
+        if job is None:
+            job = self.job_repo.add(IngestionJob(document_id=id, kind="reindex"))
+        self.session.commit()
+        self.session.refresh(job)
+        return job
+
+    def reindex(
+        self, id: int, on_progress: Callable[[str, int], None] | None = None
+    ) -> Document:
+        """
+        Refreshes the chunks of a document whose source has changed.
+
+        The source is extracted and chunked again, and the new chunk set is
+        diffed against the stored chunks by content hash: only new chunks are
+        embedded and inserted, and only chunks that disappeared are deleted.
+
+        Args:
+            id (int): Document identifier.
+            on_progress (Callable): Called as ``(stage, percent)`` while running.
+        """
+        report = on_progress or (lambda stage, percent: None)
+
+        # One job per document at a time (held until the final commit)
+        self.repo.lock_for_ingestion(id)
+        document = self.repo.get(id)
+        if not document:
+            raise ValueError(f"Document {id} not found")
+
+        report("extracting", 0)
+        pages = get_extraction_executor().extract_pages(document.source)
+
+        report("chunking", 10)
+        chunks = _chunk_pages(pages)
+
+        # Diff by content hash, as multisets (a chunk text may repeat)
+        report("diffing", 15)
+        stored: dict[str, list[int]] = defaultdict(list)
+        for chunk_id, content_hash in self.repo.get_chunk_hashes(document.id):
+            stored[content_hash].append(chunk_id)
+
+        added: list[str] = []
+        for chunk_text in chunks:
+            kept = stored.get(sha256_text(chunk_text))
+            if kept:
+                kept.pop()
+            else:
+                added.append(chunk_text)
+        removed = [chunk_id for ids in stored.values() for chunk_id in ids]
+
+        # Embed only the new chunks (20% -> 90% of the progress)
+        report("embedding", 20)
+        embeddings = self.embedding_service.embed_texts(
+            added,
+            on_progress=lambda done, total: report("embedding", 20 + 70 * done // total),
+        )
+
+        report("storing", 90)
+        self.repo.delete_chunks(removed)
+        self.repo.bulk_insert_chunks(document.id, added, embeddings)
+        document.updated_at = datetime.now(timezone.utc)
+        self.session.add(document)
+
+        self.session.commit()
+        self.session.refresh(document)
+        matrix_cache.invalidate(document.id)
+        logger.info(
+            f"Re-indexed document {document.id}: {len(chunks)} chunks, "
+            f"{len(added)} added, {len(removed)} removed"
+        )
 
         return document
 
@@ -64,6 +199,7 @@ class DocumentService:
         obj = self.repo.get(id)
         if not obj:
             return None
+        matrix_cache.invalidate(id)
         return self.repo.update(obj, data.model_dump(exclude_unset=True))
 
     def delete(self, id: int) -> bool:
@@ -71,4 +207,19 @@ class DocumentService:
         if not obj:
             return False
         self.repo.delete(obj)
+        matrix_cache.invalidate(id)
         return True
+
+
+def _chunk_pages(pages: list[str]) -> list[str]:
+    """Chunks the ordered pages of a document as one stream (see ``load_text``)."""
+    return [
+        chunk.text
+        for chunk in iter_chunks_semantic(
+            pages,
+            chunk_size=settings.CHUNK_SIZE,
+            overlap=settings.CHUNK_OVERLAP,
+            separator=" ",
+            unit=settings.CHUNK_UNIT,
+        )
+    ]
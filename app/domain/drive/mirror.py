@@ -0,0 +1,161 @@
+"""
+-------------------------------------------------------------------------
+Persistent local mirror of downloaded Google Drive files.
+
+Files are stored under ``<root>/files/<file id>`` and described in a small
+SQLite index holding each file's ``md5Checksum`` and ``modifiedTime`` at
+download time. A file whose remote metadata still matches is served from
+the mirror, so asking again over unchanged Drive files costs only the
+metadata call. Entries are evicted least-recently-used first once the
+mirrored files exceed the configured size.
+-------------------------------------------------------------------------
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mirrored_file (
+    file_id TEXT PRIMARY KEY,
+    md5_checksum TEXT,
+    modified_time TEXT,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_mirrored_file_last_used ON mirrored_file (last_used);
+"""
+
+
+def _version(file: dict) -> tuple[Optional[str], Optional[str]]:
+    return file.get("md5Checksum"), file.get("modifiedTime")
+
+
+class DriveMirror:
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.files_path = self.root / "files"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.files_path.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.root / "index.sqlite3", timeout=30, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _path(self, file_id: str) -> Path:
+        return self.files_path / file_id
+
+    def get(self, file: dict) -> Optional[Path]:
+        """
+        Returns the mirrored copy of ``file`` (Drive metadata with ``id``,
+        ``md5Checksum`` and ``modifiedTime``), or None when it is missing or
+        the remote file changed since it was mirrored.
+        """
+        md5_checksum, modified_time = _version(file)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT md5_checksum, modified_time FROM mirrored_file WHERE file_id = ?",
+                (file["id"],),
+            ).fetchone()
+
+            # The checksum decides when Drive has one (binary files): a newer
+            # modifiedTime with the same content does not need a download
+            fresh = row is not None and (
+                row[0] == md5_checksum if md5_checksum else row[1] == modified_time
+            )
+            path = self._path(file["id"])
+            if not fresh or not path.exists():
+                self.misses += 1
+                return None
+
+            conn.execute(
+                "UPDATE mirrored_file SET last_used = ? WHERE file_id = ?",
+                (time.time(), file["id"]),
+            )
+            conn.commit()
+            self.hits += 1
+        return path
+
+    def partial_path(self, file_id: str) -> Path:
+        """Temporary path to download into before ``put``."""
+        self.files_path.mkdir(parents=True, exist_ok=True)
+        return self.files_path / f".{file_id}.{uuid.uuid4().hex}.part"
+
+    def put(self, file: dict, partial_path: Path) -> Path:
+        """Moves a finished download into the mirror and records its version."""
+        md5_checksum, modified_time = _version(file)
+        path = self._path(file["id"])
+        with self._lock:
+            os.replace(partial_path, path)
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO mirrored_file "
+                "(file_id, md5_checksum, modified_time, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (file["id"], md5_checksum, modified_time, path.stat().st_size, time.time()),
+            )
+            conn.commit()
+            self._evict(conn, keep=file["id"])
+        return path
+
+    def _evict(self, conn: sqlite3.Connection, keep: str) -> None:
+        """Deletes least-recently-used files until under 90% of the budget."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM mirrored_file").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        evicted, freed = [], 0
+        for file_id, size in conn.execute(
+            "SELECT file_id, size FROM mirrored_file WHERE file_id != ? ORDER BY last_used",
+            (keep,),
+        ):
+            evicted.append(file_id)
+            freed += size
+            if total - freed <= target:
+                break
+
+        # Workspaces hold hard links, so runs using an evicted file keep their copy
+        for file_id in evicted:
+            self._path(file_id).unlink(missing_ok=True)
+        conn.executemany(
+            "DELETE FROM mirrored_file WHERE file_id = ?", [(f,) for f in evicted]
+        )
+        conn.commit()
+        logger.info(f"Drive mirror evicted {len(evicted)} files ({freed} bytes)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM mirrored_file"
+            ).fetchone()
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+drive_mirror = DriveMirror(settings.DRIVE_MIRROR_DIR, settings.DRIVE_MIRROR_MAX_MB * 1024 * 1024)
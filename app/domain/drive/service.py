@@ -1,23 +1,57 @@
+import io
 import os
 import pickle
+import threading
+import time
 import webbrowser
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from pathlib import Path
+from typing import Iterator
+
+from app.core.config import settings
+from app.domain.drive.mirror import DriveMirror, drive_mirror
 
 SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
+# Máximo permitido por files().list
+LIST_PAGE_SIZE = 1000
+# Combinaciones de filtros distintas que se guardan en la caché de listados
+LIST_CACHE_MAX_KEYS = 32
 
 
 class DriveService:
     def __init__(self):
         self.creds = None
-        self.service = self._load_service()
+        self._local = threading.local()
+        # (filtros MIME ordenados) -> (caduca en, archivos)
+        self._listings: dict[tuple[str, ...], tuple[float, list[dict]]] = {}
+        self._listing_lock = threading.Lock()
+        self.mirror: DriveMirror | None = (
+            drive_mirror if settings.DRIVE_MIRROR_ENABLED else None
+        )
+        self._load_credentials()
+
+    @property
+    def service(self):
+        """
+        Servicio Drive del hilo actual. httplib2 no es thread-safe, así que cada
+        hilo construye el suyo una sola vez (discovery estático, sin red) y lo reutiliza.
+        """
+        if getattr(self._local, "service", None) is None:
+            from googleapiclient.discovery import build
 
-    def _load_service(self):
+            self._local.service = build(
+                "drive", "v3", credentials=self.creds, cache_discovery=False
+            )
+        return self._local.service
+
+    def _load_credentials(self):
         """
         Flujo OAuth automático para WSL o entornos sin GUI.
         Muestra la URL para autorizar y captura el token automáticamente.
         """
+        # Google client libraries are imported on first use to keep startup fast
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         creds_path = "credentials.json"
         token_path = "token.pickle"
 
@@ -44,29 +78,107 @@ class DriveService:
             with open(token_path, "wb") as token:
                 pickle.dump(self.creds, token)
 
-        # Construir servicio Drive
-        return build("drive", "v3", credentials=self.creds)
+    def download_file(self, file_id: str, local_path: Path, chunk_size: int) -> None:
+        """Descarga el contenido de un archivo en ``local_path`` por bloques de ``chunk_size`` bytes."""
+        from googleapiclient.http import MediaIoBaseDownload
+
+        request = self.service.files().get_media(fileId=file_id, supportsAllDrives=True)
+        with io.FileIO(local_path, "wb") as fh:
+            downloader = MediaIoBaseDownload(fh, request, chunksize=chunk_size)
+            done = False
+            while not done:
+                status, done = downloader.next_chunk()
 
     def list_files(self, mime_filters: list[str] | None = None) -> list[dict]:
-        """Lista archivos del Drive"""
+        """Lista todos los archivos del Drive (todas las páginas)"""
+        return list(self.iter_files(mime_filters))
+
+    def iter_files(self, mime_filters: list[str] | None = None) -> Iterator[dict]:
+        """Recorre los archivos del Drive uno a uno (ver ``iter_file_pages``)"""
+        for page in self.iter_file_pages(mime_filters):
+            yield from page
+
+    def iter_file_pages(
+        self, mime_filters: list[str] | None = None
+    ) -> Iterator[list[dict]]:
+        """
+        Recorre los archivos del Drive página a página, sin esperar al listado
+        completo. El listado se guarda en caché durante DRIVE_LIST_CACHE_TTL
+        segundos por combinación de filtros, solo si se ha recorrido entero.
+        """
+        key = tuple(sorted(set(mime_filters or [])))
+        with self._listing_lock:
+            self._prune_listings()
+            cached = self._listings.get(key)
+        if cached:
+            files = cached[1]
+            for start in range(0, len(files), LIST_PAGE_SIZE):
+                yield files[start : start + LIST_PAGE_SIZE]
+            return
+
+        files = []
+        for page in self._iter_remote_pages(mime_filters):
+            files.extend(page)
+            yield page
+
+        if settings.DRIVE_LIST_CACHE_TTL > 0:
+            with self._listing_lock:
+                # Reinsertar al final: el orden del dict es el de caducidad
+                self._listings.pop(key, None)
+                self._listings[key] = (
+                    time.monotonic() + settings.DRIVE_LIST_CACHE_TTL,
+                    files,
+                )
+                while len(self._listings) > LIST_CACHE_MAX_KEYS:
+                    self._listings.pop(next(iter(self._listings)))
+
+    def invalidate_listing(self) -> int:
+        """Vacía la caché de listados; devuelve cuántos se han descartado."""
+        with self._listing_lock:
+            count = len(self._listings)
+            self._listings.clear()
+        return count
+
+    def _prune_listings(self) -> None:
+        """Descarta los listados caducados (llamar con ``_listing_lock``)."""
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._listings.items() if expires <= now]:
+            del self._listings[key]
+
+    def _iter_remote_pages(self, mime_filters: list[str] | None) -> Iterator[list[dict]]:
         query = (
-            " or ".join([f"mimeType='{m}'" for m in mime_filters])
+            " or ".join([f"mimeType='{_quote(m)}'" for m in mime_filters])
             if mime_filters
             else None
         )
-        results = (
-            self.service.files()
-            .list(q=query, fields="files(id, name, mimeType, modifiedTime, size)")
-            .execute()
-        )
-        files = results.get("files", [])
-        return [
-            {
-                "id": f["id"],
-                "name": f["name"],
-                "mimeType": f["mimeType"],
-                "size": f.get("size", "—"),
-                "modified": f.get("modifiedTime", ""),
-            }
-            for f in files
-        ]
+        page_token = None
+        while True:
+            # Sin pageToken Drive devuelve solo la primera página (100 por defecto)
+            results = (
+                self.service.files()
+                .list(
+                    q=query,
+                    pageSize=LIST_PAGE_SIZE,
+                    pageToken=page_token,
+                    fields="nextPageToken, files(id, name, mimeType, modifiedTime, size)",
+                )
+                .execute()
+            )
+            yield [
+                {
+                    "id": f["id"],
+                    "name": f["name"],
+                    "mimeType": f["mimeType"],
+                    "size": f.get("size", "—"),
+                    "modified": f.get("modifiedTime", ""),
+                }
+                for f in results.get("files", [])
+            ]
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+
+
+def _quote(value: str) -> str:
+    """Escapa un valor para usarlo entre comillas simples en la consulta ``q`` de Drive."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import ForeignKey, Integer
+from sqlmodel import Column, SQLModel, Field
+
+
+class IngestionJob(SQLModel, table=True):
+    """Represents a background job that extracts, chunks and embeds a document."""
+
+    __tablename__ = "ingestion_job"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    document_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("document.id", ondelete="CASCADE"),
+            index=True,
+            nullable=False,
+        ),
+        description="Reference to the document being processed",
+    )
+    kind: str = Field(default="ingest", description="Type of job: ingest or reindex")
+    status: str = Field(
+        default="pending",
+        index=True,
+        description="Job status: pending, running, done or failed",
+    )
+    stage: str = Field(
+        default="queued",
+        description="Current stage: queued, extracting, chunking, diffing, embedding, storing, done",
+    )
+    progress: int = Field(default=0, description="Progress percentage (0-100)")
+    error: Optional[str] = Field(default=None, description="Error message if failed")
+    attempts: int = Field(default=0, description="Number of times the job was claimed")
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    started_at: Optional[datetime] = Field(default=None)
+    heartbeat_at: Optional[datetime] = Field(
+        default=None, description="Last sign of life of the worker running the job"
+    )
+    finished_at: Optional[datetime] = Field(default=None)
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+from .models import IngestionJob
+
+
+class IngestionJobRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add(self, obj: IngestionJob) -> IngestionJob:
+        """Adds a job to the current transaction without committing it."""
+        self.session.add(obj)
+        return obj
+
+    def get(self, id: int) -> Optional[IngestionJob]:
+        return self.session.get(IngestionJob, id)
+
+    def get_latest_for_document(self, document_id: int) -> Optional[IngestionJob]:
+        statement = (
+            select(IngestionJob)
+            .where(IngestionJob.document_id == document_id)
+            .order_by(IngestionJob.id.desc())
+            .limit(1)
+        )
+        return self.session.exec(statement).first()
+
+    def get_pending_for_document(self, document_id: int) -> Optional[IngestionJob]:
+        statement = (
+            select(IngestionJob)
+            .where(
+                IngestionJob.document_id == document_id,
+                IngestionJob.status == "pending",
+            )
+            .order_by(IngestionJob.id)
+            .limit(1)
+        )
+        return self.session.exec(statement).first()
+
+    def claim_next(self, lease_seconds: float, max_attempts: int) -> Optional[IngestionJob]:
+        """
+        Atomically claims the oldest pending job, or a running job whose
+        worker stopped sending heartbeats for ``lease_seconds`` (it died).
+
+        ``SELECT ... FOR UPDATE SKIP LOCKED`` lets several workers poll the
+        table concurrently: rows locked by another worker are skipped instead
+        of waited on, and the job is marked running before the lock is released.
+        Abandoned jobs already claimed ``max_attempts`` times are marked failed
+        instead of being retried. Jobs of a document that already has a live
+        running job are skipped, so a document is processed by one job at a
+        time (concurrent claims are serialized by ``lock_for_ingestion``).
+        """
+        now = datetime.now(timezone.utc)
+        expired = now - timedelta(seconds=lease_seconds)
+        abandoned = and_(
+            IngestionJob.status == "running",
+            IngestionJob.heartbeat_at < expired,
+        )
+        other = aliased(IngestionJob)
+        document_busy = (
+            select(other.id)
+            .where(
+                other.document_id == IngestionJob.document_id,
+                other.id != IngestionJob.id,
+                other.status == "running",
+                other.heartbeat_at >= expired,
+            )
+            .exists()
+        )
+
+        self.session.exec(
+            update(IngestionJob)
+            .where(abandoned, IngestionJob.attempts >= max_attempts)
+            .values(
+                status="failed",
+                error=f"Worker lost {max_attempts} times",
+                finished_at=now,
+            )
+        )
+
+        statement = (
+            select(IngestionJob)
+            .where(or_(IngestionJob.status == "pending", abandoned), ~document_busy)
+            .order_by(IngestionJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = self.session.exec(statement).first()
+        if not job:
+            self.session.commit()
+            return None
+
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        self.session.add(job)
+        self.session.commit()
+        self.session.refresh(job)
+        return job
+
+    def update(self, obj: IngestionJob, data: dict) -> IngestionJob:
+        for key, value in data.items():
+            setattr(obj, key, value)
+        self.session.add(obj)
+        self.session.commit()
+        self.session.refresh(obj)
+        return obj
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel
+
+
+class IngestionJobRead(SQLModel):
+    id: int
+    document_id: int
+    kind: str
+    status: str
+    stage: str
+    progress: int
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,81 @@
+import logging
+import time
+from datetime import datetime, timezone
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.resources import Resources
+from app.domain.document.service import DocumentService
+from .models import IngestionJob
+from .repository import IngestionJobRepository
+
+logger = logging.getLogger("app")
+
+
+class IngestionJobService:
+    """Runs claimed ingestion jobs and records their stage and progress."""
+
+    def __init__(self, session: Session, resources: Resources):
+        self.session = session
+        self.resources = resources
+        self.repo = IngestionJobRepository(session)
+
+    def claim_next(self) -> IngestionJob | None:
+        return self.repo.claim_next(
+            lease_seconds=settings.INGESTION_JOB_LEASE_SECONDS,
+            max_attempts=settings.INGESTION_JOB_MAX_ATTEMPTS,
+        )
+
+    def run(self, job: IngestionJob) -> IngestionJob:
+        """
+        Processes a running job. The document work happens in its own session,
+        so progress updates can be committed without committing partial chunks.
+        Progress reports double as the heartbeat that keeps the job's lease.
+        """
+        beat_every = settings.INGESTION_JOB_LEASE_SECONDS / 3
+        last_beat = time.monotonic()
+
+        def on_progress(stage: str, percent: int) -> None:
+            nonlocal last_beat
+            now = time.monotonic()
+            if (stage, percent) != (job.stage, job.progress) or now - last_beat > beat_every:
+                self.repo.update(
+                    job,
+                    {
+                        "stage": stage,
+                        "progress": percent,
+                        "heartbeat_at": datetime.now(timezone.utc),
+                    },
+                )
+                last_beat = now
+
+        try:
+            with Session(engine) as work_session:
+                svc = DocumentService(work_session, self.resources)
+                # A retried ingest may have committed its chunks before the
+                # worker died: re-index instead, which only adds missing chunks
+                if job.kind == "reindex" or job.attempts > 1:
+                    svc.reindex(job.document_id, on_progress)
+                else:
+                    svc.ingest(job.document_id, on_progress)
+        except Exception as e:
+            logger.exception(f"Ingestion job {job.id} failed: {e}")
+            return self.repo.update(
+                job,
+                {
+                    "status": "failed",
+                    "error": str(e),
+                    "finished_at": datetime.now(timezone.utc),
+                },
+            )
+
+        return self.repo.update(
+            job,
+            {
+                "status": "done",
+                "stage": "done",
+                "progress": 100,
+                "finished_at": datetime.now(timezone.utc),
+            },
+        )
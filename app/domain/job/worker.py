@@ -0,0 +1,101 @@
+"""
+-------------------------------------------------------------------------
+Background worker that polls the ingestion_job table and runs pending jobs.
+
+Started inside the API process by the FastAPI lifespan (INGESTION_WORKERS
+threads), or standalone with:
+
+    python -m app.domain.job.worker
+
+Jobs are leased: a worker refreshes ``heartbeat_at`` while it runs a job,
+and a job whose worker stopped beating for INGESTION_JOB_LEASE_SECONDS is
+claimed again, up to INGESTION_JOB_MAX_ATTEMPTS times.
+
+Workers may live in another process than the API (standalone, or several
+uvicorn workers): the ``matrix_cache.invalidate`` calls made after ingestion
+only reach the worker's own process, so the API validates its cached
+matrices against the chunks in the database on every search instead of
+relying on them (see ``RetrievalService.get_matrices``).
+-------------------------------------------------------------------------
+"""
+
+import logging
+import threading
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.resources import Resources
+from .service import IngestionJobService
+
+logger = logging.getLogger("app")
+
+
+class IngestionWorker:
+    def __init__(
+        self,
+        resources: Resources,
+        name: str = "ingestion-worker",
+        poll_interval: float | None = None,
+    ):
+        self.resources = resources
+        self.name = name
+        self.poll_interval = poll_interval or settings.INGESTION_POLL_INTERVAL
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.run_forever, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run_forever(self) -> None:
+        logger.info(f"{self.name} started")
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.exception(f"{self.name} failed to poll jobs: {e}")
+                processed = False
+            if not processed:
+                self._stop.wait(self.poll_interval)
+        logger.info(f"{self.name} stopped")
+
+    def run_once(self) -> bool:
+        """Claims and runs one pending job. Returns False when the queue is empty."""
+        with Session(engine) as session:
+            svc = IngestionJobService(session, self.resources)
+            job = svc.claim_next()
+            if not job:
+                return False
+            logger.info(f"{self.name} running job {job.id} (document {job.document_id})")
+            svc.run(job)
+            return True
+
+
+def start_workers(resources: Resources, count: int | None = None) -> list[IngestionWorker]:
+    count = settings.INGESTION_WORKERS if count is None else count
+    workers = [
+        IngestionWorker(resources, name=f"ingestion-worker-{i}") for i in range(count)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+if __name__ == "__main__":
+    from app.core.logging_config import setup_logging
+
+    from app.domain.document.repository import check_vector_backend
+
+    setup_logging()
+    check_vector_backend(engine)
+    resources = Resources()
+    try:
+        IngestionWorker(resources).run_forever()
+    finally:
+        resources.close()
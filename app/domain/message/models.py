@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from sqlmodel import SQLModel, Field, Relationship
 
@@ -16,7 +16,7 @@ class Message(SQLModel, table=True):
     )
     content: str = Field(nullable=False, description="Text content of the message")
     created_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=lambda: datetime.now(timezone.utc),
         nullable=False,
         description="Timestamp when the message was created",
     )
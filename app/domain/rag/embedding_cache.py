@@ -0,0 +1,164 @@
+"""
+-------------------------------------------------------------------------
+Persistent embedding cache keyed by (model name, sha256(normalized text)).
+
+Backed by a local SQLite file so it survives restarts and is shared by all
+workers on the host. Entries are evicted least-recently-used first once the
+stored vectors exceed the configured size.
+-------------------------------------------------------------------------
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.utils.embedding_codec import decode_embedding, encode_embedding
+
+logger = logging.getLogger("app")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, text_hash)
+);
+CREATE INDEX IF NOT EXISTS ix_embedding_last_used ON embedding (last_used);
+"""
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the whitespace-normalized text."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, path: Path, max_bytes: int, touch_interval: float = 3600):
+        """
+        Args:
+            path (Path): SQLite file of the cache.
+            max_bytes (int): Budget of the stored vectors.
+            touch_interval (float): Seconds before a hit refreshes ``last_used``.
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self._conn: sqlite3.Connection | None = None
+        self._size = 0  # bytes of stored vectors, counted once when opening
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._size = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding"
+            ).fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        """Returns the cached vectors found for ``hashes``, keyed by hash."""
+        unique = list(dict.fromkeys(hashes))
+        found: dict[str, list[float]] = {}
+        now = time.time()
+        stale: list[str] = []
+
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(unique), 500):
+                batch = unique[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector, last_used FROM embedding "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for h, vector, last_used in rows:
+                    found[h] = decode_embedding(vector).tolist()
+                    if now - last_used > self.touch_interval:
+                        stale.append(h)
+
+            # LRU order only needs to be approximate: skip the write (and its
+            # fsync) unless an entry has not been touched for a while
+            if stale:
+                conn.executemany(
+                    "UPDATE embedding SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, h) for h in stale],
+                )
+                conn.commit()
+
+            self.hits += sum(1 for h in hashes if h in found)
+            self.misses += sum(1 for h in hashes if h not in found)
+        return found
+
+    def put_many(self, model: str, items: dict[str, list[float]]) -> None:
+        if not items:
+            return
+        now = time.time()
+        rows = [(model, h, encode_embedding(v), now) for h, v in items.items()]
+        with self._lock:
+            conn = self._connection()
+            replaced = 0
+            hashes = list(items)
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                replaced += conn.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding (model, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+            self._size += sum(len(row[2]) for row in rows) - replaced
+            if self._size > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Deletes least-recently-used entries until under 90% of the budget."""
+        target = int(self.max_bytes * 0.9)
+        evicted, freed = [], 0
+        for rowid, size in conn.execute(
+            "SELECT rowid, LENGTH(vector) FROM embedding ORDER BY last_used, rowid"
+        ):
+            evicted.append((rowid,))
+            freed += size
+            if self._size - freed <= target:
+                break
+        conn.executemany("DELETE FROM embedding WHERE rowid = ?", evicted)
+        conn.commit()
+        self._size -= freed
+        logger.info(f"Embedding cache evicted {freed} bytes")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM embedding").fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+embedding_cache = EmbeddingCache(
+    settings.TEXT_EMBEDDING_CACHE_PATH,
+    settings.TEXT_EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+    settings.TEXT_EMBEDDING_CACHE_TOUCH_SECONDS,
+)
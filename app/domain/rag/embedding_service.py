@@ -1,55 +1,193 @@
-import shutil
-from typing import List
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, TextLoader
-from langchain_community.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
 from pathlib import Path
 
+from app.core.config import settings
+from app.domain.rag.embedding_cache import embedding_cache, text_hash
+from app.utils.file_loader import iter_text
+
+logger = logging.getLogger("app")
+
 
 class EmbeddingService:
-    def __init__(self):
-        self.index_path = Path("data/faiss_index")
-        self.index_path.mkdir(parents=True, exist_ok=True)
-        self.embedding_model = OpenAIEmbeddings()
+    def __init__(self, embedding_model=None):
+        """
+        Args:
+            embedding_model: Shared LangChain embeddings client (see
+                ``Resources.embeddings``). Created on first use when omitted.
+        """
+        self._embedding_model = embedding_model
+        self.cache = embedding_cache if settings.TEXT_EMBEDDING_CACHE_ENABLED else None
+
+    @property
+    def embedding_model(self):
+        """OpenAI embeddings client, created (and LangChain imported) on first use."""
+        if self._embedding_model is None:
+            from langchain_openai import OpenAIEmbeddings
+
+            self._embedding_model = OpenAIEmbeddings()
+        return self._embedding_model
 
     def create_embeddings(self, docs_path: Path):
+        from langchain_community.vectorstores import FAISS
+        from langchain_core.documents import Document
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        # Text comes from the extracted-text cache, so files seen before
+        # (e.g. on every /rag/ask over the same Drive files) are not re-parsed
         all_docs = []
         for file in docs_path.iterdir():
-            if file.suffix == ".pdf":
-                loader = PyPDFLoader(str(file))
-            elif file.suffix == ".docx":
-                loader = Docx2txtLoader(str(file))
-            elif file.suffix in [".txt", ".md"]:
-                loader = TextLoader(str(file))
-            else:
+            if file.suffix not in [".pdf", ".docx", ".txt", ".md"]:
                 continue
-            all_docs.extend(loader.load())
+            for page, text in iter_text(str(file)):
+                metadata = {"source": str(file)}
+                if file.suffix == ".pdf":
+                    metadata["page"] = page - 1
+                all_docs.append(Document(page_content=text, metadata=metadata))
 
         splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
         chunks = splitter.split_documents(all_docs)
-        embeddings = OpenAIEmbeddings()
-        db = FAISS.from_documents(chunks, embeddings)
-        db.save_local(str(self.index_path))
-        return db
-
-    def load_embeddings(self):
-        embeddings = OpenAIEmbeddings()
-        return FAISS.load_local(
-            str(self.index_path), embeddings, allow_dangerous_deserialization=True
-        )
+        # Built in memory: persisting it is up to the FAISS index store
+        return FAISS.from_documents(chunks, self.embedding_model)
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.embedding_model, "model", type(self.embedding_model).__name__)
 
     def embed_text(self, text: str) -> List[float]:
         """
         Generates an embedding for a single text input using the same model.
+        Served from the persistent embedding cache when possible.
+
+        Args:
+            text (str): Input text or chunk.
+        Returns:
+            List[float]: Embedding vector.
+        """
+        if not self.cache:
+            return self.embedding_model.embed_query(text)
+
+        key = text_hash(text)
+        cached = self.cache.get_many(self.model_name, [key])
+        if key in cached:
+            return cached[key]
+        vector = self.embedding_model.embed_query(text)
+        self.cache.put_many(self.model_name, {key: vector})
+        return vector
+
+    async def aembed_text(self, text: str) -> List[float]:
+        """
+        Async variant of ``embed_text``: the API call does not block the event
+        loop, and the (SQLite) embedding cache is consulted in a thread.
 
         Args:
             text (str): Input text or chunk.
         Returns:
             List[float]: Embedding vector.
         """
-        return self.embedding_model.embed_query(text)
+        if not self.cache:
+            return await self.embedding_model.aembed_query(text)
+
+        key = text_hash(text)
+        cached = await asyncio.to_thread(self.cache.get_many, self.model_name, [key])
+        if key in cached:
+            return cached[key]
+        vector = await self.embedding_model.aembed_query(text)
+        await asyncio.to_thread(self.cache.put_many, self.model_name, {key: vector})
+        return vector
+
+    def embed_texts(
+        self,
+        texts: List[str],
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+        max_retries: int | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> List[List[float]]:
+        """
+        Generates embeddings for many texts in batches, with a bounded number
+        of batches in flight at once. Texts already in the persistent embedding
+        cache (or repeated within ``texts``) are not sent to the API.
+
+        Args:
+            texts (List[str]): Input texts or chunks.
+            batch_size (int): Texts per embedding request.
+            max_concurrency (int): Maximum number of parallel requests.
+            max_retries (int): Retries per failed batch (exponential backoff).
+            on_progress (Callable): Called as ``(done, total)`` after each batch.
+        Returns:
+            List[List[float]]: Embedding vectors, in the same order as ``texts``.
+        """
+        if not self.cache:
+            return self._embed_in_batches(
+                texts, batch_size, max_concurrency, max_retries, on_progress
+            )
+
+        hashes = [text_hash(t) for t in texts]
+        vectors = self.cache.get_many(self.model_name, hashes)
+        pending = {h: t for h, t in zip(hashes, texts) if h not in vectors}
+        hits = len(texts) - len(pending)
+
+        def report(done: int, total: int) -> None:
+            if on_progress:
+                on_progress(hits + done, hits + total)
+
+        fresh = self._embed_in_batches(
+            list(pending.values()), batch_size, max_concurrency, max_retries, report
+        )
+        new_vectors = dict(zip(pending.keys(), fresh))
+        self.cache.put_many(self.model_name, new_vectors)
+        vectors.update(new_vectors)
+
+        logger.info(
+            f"Embedded {len(texts)} texts: {hits} cached, {len(pending)} requested "
+            f"(cache stats: hits={self.cache.hits}, misses={self.cache.misses})"
+        )
+        return [vectors[h] for h in hashes]
+
+    def _embed_in_batches(
+        self,
+        texts: List[str],
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+        max_retries: int | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> List[List[float]]:
+        batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        max_concurrency = max_concurrency or settings.EMBEDDING_MAX_CONCURRENCY
+        if max_retries is None:
+            max_retries = settings.EMBEDDING_MAX_RETRIES
+
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        if not batches:
+            return []
+
+        def embed_batch(batch: List[str]) -> List[List[float]]:
+            return self._embed_batch(batch, max_retries)
+
+        # ``map`` yields results in submission order, keeping chunk order
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as pool:
+            vectors: List[List[float]] = []
+            for batch in pool.map(embed_batch, batches):
+                vectors.extend(batch)
+                if on_progress:
+                    on_progress(len(vectors), len(texts))
+            return vectors
 
-    def cleanup(self):
-        shutil.rmtree(self.index_path, ignore_errors=True)
-        self.index_path.mkdir(parents=True, exist_ok=True)
+    def _embed_batch(self, batch: List[str], max_retries: int) -> List[List[float]]:
+        """Embeds one batch, retrying with exponential backoff on failure."""
+        for attempt in range(max_retries + 1):
+            try:
+                return self.embedding_model.embed_documents(batch)
+            except Exception as e:
+                if attempt == max_retries:
+                    raise
+                delay = 2**attempt
+                logger.warning(
+                    f"Embedding batch of {len(batch)} failed ({e}), "
+                    f"retrying in {delay}s ({attempt + 1}/{max_retries})"
+                )
+                time.sleep(delay)
@@ -0,0 +1,161 @@
+"""
+-------------------------------------------------------------------------
+Persistent store of the FAISS indexes built by the Drive RAG pipeline.
+
+An index is keyed by the embedding model and the sorted Drive file ids
+together with each file's ``modifiedTime`` and ``md5Checksum``, so a
+follow-up question over the same, unchanged files is answered from the
+stored index without downloading, parsing or embedding anything. Editing
+any of the files changes the key. Entries are evicted least-recently-used
+first once the store exceeds its size budget.
+-------------------------------------------------------------------------
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+# Bump whenever the way indexes are built changes (text extraction,
+# splitter settings), so indexes built the old way are no longer served.
+INDEX_VERSION = 1
+
+
+def index_key(files: list[dict], model: str) -> str:
+    """
+    Returns the store key of the index over ``files``.
+
+    Args:
+        files (list[dict]): Drive metadata with ``id``, ``modifiedTime`` and
+            ``md5Checksum`` (absent for Google Docs, which only have the former).
+        model (str): Embedding model name.
+    Returns:
+        str: Hex SHA-256 of the index identity.
+    """
+    identity = {
+        "version": INDEX_VERSION,
+        "model": model,
+        "files": sorted(
+            [f["id"], f.get("modifiedTime"), f.get("md5Checksum")] for f in files
+        ),
+    }
+    payload = json.dumps(identity, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FaissIndexStore:
+    """
+    Size-bounded LRU store of saved FAISS indexes, one directory per key.
+
+    Args:
+        root (Path): Directory holding the stored indexes.
+        max_bytes (int): Budget for all stored indexes on disk.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def get(self, key: str, embeddings: Any) -> Optional[Any]:
+        """
+        Loads the stored index for ``key`` with ``embeddings`` as its query
+        embedder, or returns None on a miss. A hit refreshes the LRU position.
+        """
+        from langchain_community.vectorstores import FAISS
+
+        path = self._path(key)
+        try:
+            db = FAISS.load_local(
+                str(path), embeddings, allow_dangerous_deserialization=True
+            )
+            os.utime(path)
+        except (FileNotFoundError, RuntimeError):
+            # Missing, or evicted by another worker while being read
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return db
+
+    def put(self, key: str, db: Any) -> None:
+        """
+        Saves ``db`` under ``key``. The index is written to a temporary
+        directory and renamed into place, so readers never see a partial one.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f".{uuid.uuid4().hex}.part"
+        try:
+            db.save_local(str(tmp_path))
+            try:
+                os.rename(tmp_path, self._path(key))
+            except OSError:
+                # Another worker stored the same index meanwhile
+                return
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+        with self._lock:
+            self._evict()
+
+    # ============================================================
+    #                          Eviction
+    # ============================================================
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.iterdir() if self.root.exists() else []:
+            if path.name.startswith("."):
+                continue
+            try:
+                mtime = path.stat().st_mtime
+                size = sum(f.stat().st_size for f in path.iterdir())
+            except FileNotFoundError:
+                continue
+            entries.append((mtime, size, path))
+        return entries
+
+    def _evict(self) -> None:
+        """Deletes least-recently-used indexes while over the budget."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        freed = 0
+        # The newest entry is always kept, even when it alone exceeds the budget
+        for _, size, path in entries[:-1]:
+            if total - freed <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            freed += size
+
+        if freed:
+            logger.info(f"FAISS index store evicted {freed} bytes")
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+faiss_index_store = FaissIndexStore(
+    settings.FAISS_INDEX_CACHE_DIR, settings.FAISS_INDEX_CACHE_MAX_MB * 1024 * 1024
+)
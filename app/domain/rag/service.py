@@ -1,25 +1,37 @@
-from datetime import datetime
 from sqlmodel import Session
-from langchain.chains import RetrievalQA
-from langchain_openai import ChatOpenAI
+from app.core.config import settings
+from app.core.resources import Resources
 from app.domain.message.models import Message
 from app.domain.chat.models import Chat
 from app.domain.rag.document_service import DocumentService
 from app.domain.rag.embedding_service import EmbeddingService
+from app.domain.rag.index_store import faiss_index_store, index_key
+from app.domain.rag.workspace import Workspace
 
 
 class RagService:
     """Main orchestrator for the full RAG pipeline (Drive → FAISS → LLM → DB)."""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, resources: Resources):
         self.session = session
-        self.docs = DocumentService()
-        self.embeddings = EmbeddingService()
+        self.resources = resources
+        self.docs = DocumentService(resources.drive)
+        self.embeddings = EmbeddingService(resources.embeddings)
+        self.index_store = (
+            faiss_index_store if settings.FAISS_INDEX_CACHE_ENABLED else None
+        )
 
     def _query(self, db, question: str) -> str:
         """Run the LLM query with FAISS retriever."""
+        from langchain.chains import RetrievalQA
+        from langchain_openai import ChatOpenAI
+
         retriever = db.as_retriever(search_kwargs={"k": 4})
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+        llm = ChatOpenAI(
+            model="gpt-4o-mini",
+            temperature=0.3,
+            http_client=self.resources.http_client,
+        )
         qa = RetrievalQA.from_chain_type(
             llm=llm, retriever=retriever, chain_type="stuff"
         )
@@ -29,31 +41,42 @@ class RagService:
     def run_pipeline(self, chat_id: int, question: str, file_ids: list[str]):
         """Complete RAG flow with database persistence."""
         # Save user message
-        user_msg = Message(
-            chat_id=chat_id,
-            sender="user",
-            content=question,
-            created_at=datetime.utcnow(),
-        )
+        user_msg = Message(chat_id=chat_id, sender="user", content=question)
         self.session.add(user_msg)
         self.session.commit()
         self.session.refresh(user_msg)
 
         # Process RAG
-        self.docs.download_documents(file_ids)
-        db = self.embeddings.create_embeddings(self.docs.docs_path)
+        db = self._get_index(file_ids)
         answer = self._query(db, question)
 
-        # Clean temporary data
-        self.docs.cleanup()
-        self.embeddings.cleanup()
-
         #  Save bot message
-        bot_msg = Message(
-            chat_id=chat_id, sender="bot", content=answer, created_at=datetime.utcnow()
-        )
+        bot_msg = Message(chat_id=chat_id, sender="bot", content=answer)
         self.session.add(bot_msg)
         self.session.commit()
         self.session.refresh(bot_msg)
 
         return {"user_message": user_msg, "bot_message": bot_msg}
+
+    def _get_index(self, file_ids: list[str]):
+        """
+        Returns the FAISS index over the given Drive files. Unchanged file sets
+        are served from the index store after a single metadata call; otherwise
+        the files are downloaded and embedded, and the index is stored.
+        """
+        files = self.docs.get_metadata(file_ids)
+        key = index_key(files, self.embeddings.model_name)
+        if self.index_store:
+            db = self.index_store.get(key, self.embeddings.embedding_model)
+            if db is not None:
+                return db
+
+        # Downloads go to a private workspace, deleted (alone) when done
+        with Workspace() as workspace:
+            downloads = self.docs.download_documents(files, workspace.docs_path)
+            db = self.embeddings.create_embeddings(workspace.docs_path)
+
+        # An index missing a failed download must not be served again
+        if self.index_store and not any(d.error for d in downloads):
+            self.index_store.put(key, db)
+        return db
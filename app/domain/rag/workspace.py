@@ -0,0 +1,40 @@
+"""
+-------------------------------------------------------------------------
+Scratch workspace of one Drive RAG pipeline run.
+
+Each run downloads its files into its own ``<RAG_WORKSPACE_DIR>/<uuid>``
+directory and deletes only that directory when it finishes, so concurrent
+runs never see (or delete) each other's files. Indexes that outlive the
+run are kept in the FAISS index store, not here.
+-------------------------------------------------------------------------
+"""
+
+import shutil
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+
+class Workspace:
+    """
+    Private directory tree of a pipeline run, removed on exit.
+
+    Args:
+        root (Path): Parent directory of all workspaces.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.path = Path(root or settings.RAG_WORKSPACE_DIR) / uuid.uuid4().hex
+        self.docs_path = self.path / "docs"
+
+    def __enter__(self) -> "Workspace":
+        self.docs_path.mkdir(parents=True)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cleanup()
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -1,8 +1,14 @@
 from contextlib import asynccontextmanager
 import logging
 from fastapi import FastAPI
-from app.core.database import init_db
+from app.core.config import settings
+from app.core.database import dispose_async_engine, engine, init_db
 from app.core.logging_config import setup_logging
+from app.core.resources import Resources
+from app.domain.document.repository import check_vector_backend
+from app.domain.job.worker import start_workers
+from app.utils.extraction_executor import shutdown_extraction_executor
+from app.utils.uploads import UploadSizeLimitMiddleware
 from app.routers.drive import router as drive_router
 from app.routers.rag import router as rag_router
 from app.routers.user import router as user_router
@@ -13,24 +19,40 @@ from app.routers.document import router as document_router
 setup_logging()
 logger = logging.getLogger("app")
 
-app = FastAPI(title="Chatbot RAG Backend")
-
-app.include_router(drive_router)
-app.include_router(rag_router)
-app.include_router(user_router)
-app.include_router(chat_router)
-app.include_router(message_router)
-app.include_router(document_router)
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Init Crecenia Chatbot...")
     init_db()
+    check_vector_backend(engine)
+    app.state.resources = Resources()
+    workers = start_workers(app.state.resources)
     yield
+    for worker in workers:
+        worker.stop(timeout=5)
+    shutdown_extraction_executor()
+    await app.state.resources.aclose()
+    await dispose_async_engine()
     logger.info("Closing Crecenia Chatbot...")
 
 
+app = FastAPI(title="Chatbot RAG Backend", lifespan=lifespan)
+
+# Refuse oversized uploads before their body is spooled (plus 1 MB of form fields)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=(settings.UPLOAD_MAX_MB + 1) * 1024 * 1024,
+    path_prefixes=("/document",),
+)
+
+app.include_router(drive_router)
+app.include_router(rag_router)
+app.include_router(user_router)
+app.include_router(chat_router)
+app.include_router(message_router)
+app.include_router(document_router)
+
+
 @app.get("/")
 def root():
     return {"message": "Chatbot RAG Backend running"}
@@ -1,17 +1,36 @@
-from typing import List
+import json
+import logging
+from typing import Iterator, List
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
-from app.core.database import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_async_session, get_session
+from app.core.resources import Resources, get_resources
+from app.domain.chat.async_service import AsyncChatService
 from app.domain.chat.service import ChatService
 from app.domain.chat.schemas import ChatCreate, ChatRead, ChatPage
+from app.domain.message.models import Message
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/chat", tags=["chat"])
+logger = logging.getLogger("app")
 
 
-def get_service(session: Session = Depends(get_session)) -> ChatService:
-    """Inject ChatService with an active database session."""
-    return ChatService(session)
+def get_service(
+    session: Session = Depends(get_session),
+    resources: Resources = Depends(get_resources),
+) -> ChatService:
+    """Inject ChatService with an active database session and the shared clients."""
+    return ChatService(session, resources)
+
+
+def get_async_service(
+    session: AsyncSession = Depends(get_async_session),
+    resources: Resources = Depends(get_resources),
+) -> AsyncChatService:
+    """Inject AsyncChatService with an async database session and the shared clients."""
+    return AsyncChatService(session, resources)
 
 
 @router.get("", response_model=ChatPage)
@@ -59,3 +78,56 @@ def ask_question(
         return {"answer": answer.content}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{chat_id}/ask/async")
+async def ask_question_async(
+    chat_id: int,
+    payload: ChatAsk,
+    svc: AsyncChatService = Depends(get_async_service),
+):
+    """
+    Same as ``/ask``, but served on the event loop: waiting on OpenAI or the
+    database does not tie up a worker thread, so one process can keep many
+    more questions in flight.
+    """
+    try:
+        answer = await svc.ask(chat_id, payload.question)
+        return {"answer": answer.content}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{chat_id}/ask/stream")
+def ask_question_stream(
+    chat_id: int,
+    payload: ChatAsk,
+    svc: ChatService = Depends(get_service),
+):
+    """
+    Ask a question and stream the answer as Server-Sent Events:
+    ``token`` events carry text deltas, a final ``done`` event carries the
+    saved assistant message, and ``error`` reports a failure mid-stream.
+    """
+
+    def events() -> Iterator[str]:
+        try:
+            for item in svc.ask_stream(chat_id, payload.question):
+                if isinstance(item, Message):
+                    yield _sse("done", {"message_id": item.id, "content": item.content})
+                else:
+                    yield _sse("token", {"delta": item})
+        except Exception as e:
+            logger.exception(f"Streaming answer for chat {chat_id} failed: {e}")
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering (nginx) so tokens reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -8,21 +8,39 @@ from fastapi import (
     Query,
     UploadFile,
 )
+from pathlib import Path as FilePath
 from sqlmodel import Session
+from app.core.config import settings
 from app.core.database import get_session
+from app.core.resources import Resources, get_resources
 from app.domain.document.service import DocumentService
 from app.domain.document.schemas import (
     DocumentCreate,
     DocumentRead,
     DocumentPage,
     DocumentUpdate,
+    DocumentUploadRead,
 )
+from app.domain.job.schemas import IngestionJobRead
+from app.utils.uploads import StoredUpload, UploadTooLargeError, save_upload
 
 router = APIRouter(prefix="/document", tags=["document"])
 
 
-def get_service(session: Session = Depends(get_session)) -> DocumentService:
-    return DocumentService(session)
+async def _store_upload(file: UploadFile) -> StoredUpload:
+    return await save_upload(
+        file,
+        FilePath(settings.UPLOAD_DIR),
+        max_bytes=settings.UPLOAD_MAX_MB * 1024 * 1024,
+        chunk_size=settings.UPLOAD_CHUNK_KB * 1024,
+    )
+
+
+def get_service(
+    session: Session = Depends(get_session),
+    resources: Resources = Depends(get_resources),
+) -> DocumentService:
+    return DocumentService(session, resources)
 
 
 @router.get("", response_model=DocumentPage)
@@ -39,7 +57,7 @@ def list_document(
     return DocumentPage(total=total, items=items)
 
 
-@router.get("/<built-in function id>", response_model=DocumentRead)
+@router.get("/{id}", response_model=DocumentRead)
 def get_document(id: int, svc: DocumentService = Depends(get_service)):
     obj = svc.get(id)
     if not obj:
@@ -47,7 +65,41 @@ def get_document(id: int, svc: DocumentService = Depends(get_service)):
     return obj
 
 
-@router.post("", response_model=DocumentRead)
+@router.get("/{document_id}/status", response_model=IngestionJobRead)
+def get_document_status(document_id: int, svc: DocumentService = Depends(get_service)):
+    """Returns the stage and progress of the document's latest ingestion job."""
+    job = svc.get_status(document_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
+
+
+@router.post("/{document_id}/reindex", response_model=IngestionJobRead)
+async def reindex_document(
+    document_id: int,
+    file: UploadFile | None = File(None),
+    svc: DocumentService = Depends(get_service),
+):
+    """
+    Enqueues an incremental re-index of the document: only changed chunks are
+    re-embedded. When a file is sent it replaces the document's current file
+    first. Progress is reported by the status endpoint.
+    """
+    source = None
+    if file is not None:
+        try:
+            stored = await _store_upload(file)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        source = str(stored.path)
+
+    job = svc.enqueue_reindex(document_id, source=source)
+    if not job:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return job
+
+
+@router.post("", response_model=DocumentUploadRead)
 async def create_document(
     title: str = Form(...),
     description: str = Form(None),
@@ -56,35 +108,32 @@ async def create_document(
     svc: DocumentService = Depends(get_service),
 ):
     """
-    Uploads a document file and automatically triggers text extraction,
-    chunking, and embedding generation.
+    Uploads a document file and enqueues its ingestion job (text extraction,
+    chunking, and embedding generation). Returns immediately with the job id;
+    progress is available at ``GET /document/{id}/status``.
     """
     try:
-        # Save uploaded file
-        from pathlib import Path
-
-        docs_path = Path("data/docs")
-        docs_path.mkdir(parents=True, exist_ok=True)
-
-        file_path = docs_path / file.filename
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
+        # Stream the upload to a content-addressed path
+        stored = await _store_upload(file)
 
         # Build payload for DocumentService
         payload = DocumentCreate(
             title=title,
             description=description,
             owner_id=owner_id,
-            source=str(file_path),
+            source=str(stored.path),
         )
 
-        return svc.create(payload)
+        document, job = svc.create(payload)
+        return DocumentUploadRead(**document.model_dump(), job_id=job.id)
 
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.put("/<built-in function id>", response_model=DocumentRead)
+@router.put("/{id}", response_model=DocumentRead)
 def update_document(
     id: int, payload: DocumentUpdate, svc: DocumentService = Depends(get_service)
 ):
@@ -94,7 +143,7 @@ def update_document(
     return obj
 
 
-@router.delete("/<built-in function id>")
+@router.delete("/{id}")
 def delete_document(id: int, svc: DocumentService = Depends(get_service)):
     ok = svc.delete(id)
     if not ok:
@@ -1,20 +1,52 @@
-from fastapi import APIRouter
-from app.domain.drive.service import DriveService
+import json
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.core.resources import Resources, get_resources
 
 router = APIRouter(prefix="/drive", tags=["Drive"])
 
+DOCUMENT_MIME_TYPES = [
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text/plain",
+]
+
 
 @router.get("/files")
-def list_drive_files():
+def list_drive_files(
+    mime_types: Optional[List[str]] = Query(None),
+    resources: Resources = Depends(get_resources),
+):
     """
     Lista todos los documentos del Drive.
     """
-    drive = DriveService()
-    docs = drive.list_files(
-        mime_filters=[
-            "application/pdf",
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            "text/plain",
-        ]
-    )
+    docs = resources.drive.list_files(mime_filters=mime_types or DOCUMENT_MIME_TYPES)
     return {"total": len(docs), "files": docs}
+
+
+@router.get("/files/stream")
+def stream_drive_files(
+    mime_types: Optional[List[str]] = Query(None),
+    resources: Resources = Depends(get_resources),
+):
+    """
+    Lista los documentos del Drive como NDJSON (un archivo por línea),
+    enviando cada página en cuanto llega de Drive.
+    """
+    drive = resources.drive
+
+    def lines() -> Iterator[str]:
+        for page in drive.iter_file_pages(mime_filters=mime_types or DOCUMENT_MIME_TYPES):
+            if page:
+                yield "".join(json.dumps(file) + "\n" for file in page)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.delete("/files/cache")
+def invalidate_drive_files_cache(resources: Resources = Depends(get_resources)):
+    """
+    Descarta los listados en caché para que la próxima consulta vaya a Drive.
+    """
+    return {"invalidated": resources.drive.invalidate_listing()}
@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Depends
+from sqlmodel import Session
 
+from app.core.database import get_session
+from app.core.resources import Resources, get_resources
 from app.domain.rag.service import RagService
 
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
 @router.post("/ask")
 def ask_rag(
+    chat_id: int = Body(..., embed=True),
     question: str = Body(..., embed=True),
-    file_ids: list[str] = Body(..., embed=True)
+    file_ids: list[str] = Body(..., embed=True),
+    session: Session = Depends(get_session),
+    resources: Resources = Depends(get_resources),
 ):
     """
     Flujo completo: descarga docs → crea embeddings → responde → limpia → devuelve respuesta.
     """
-    rag = RagService()
+    rag = RagService(session, resources)
     try:
-        answer = rag.run_pipeline(question, file_ids)
+        answer = rag.run_pipeline(chat_id, question, file_ids)
         return {"answer": answer}
     except Exception as e:
         return {"error": str(e)}
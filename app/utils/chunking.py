@@ -1,32 +1,70 @@
 from __future__ import annotations
+import importlib.util
 import logging
-from typing import List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
 import re
 from app.core.logging_config import setup_logging
+from app.utils.tokens import count_tokens, token_offsets
 
 setup_logging()
 logger = logging.getLogger("app")
 
 
 # ============================================================
-#       Try to import NLTK and ensure required models exist
+#       NLTK sentence tokenizer (optional, loaded on first use)
 # ============================================================
-try:
-    import nltk
 
-    # Automatically download required resources if not found
-    for resource in ["punkt", "punkt_tab"]:
-        try:
-            nltk.data.find(f"tokenizers/{resource}")
-        except LookupError:
-            nltk.download(resource, quiet=True)
+# Only checked here: importing NLTK and checking its punkt models is slow
+NLTK_AVAILABLE = importlib.util.find_spec("nltk") is not None
 
-    from nltk.tokenize import sent_tokenize
 
-    NLTK_AVAILABLE = True
-except Exception:
-    # NLTK not available or resource download failed
-    NLTK_AVAILABLE = False
+@lru_cache(maxsize=None)
+def _get_sent_tokenize() -> Optional[Callable[[str], List[str]]]:
+    """
+    Returns NLTK's ``sent_tokenize`` once its punkt models are available,
+    downloading them if needed, or None to use the regex fallback.
+    """
+    if not NLTK_AVAILABLE:
+        return None
+    try:
+        import nltk
+
+        # Automatically download required resources if not found
+        for resource in ["punkt", "punkt_tab"]:
+            try:
+                nltk.data.find(f"tokenizers/{resource}")
+            except LookupError:
+                nltk.download(resource, quiet=True)
+
+        from nltk.tokenize import sent_tokenize
+
+        sent_tokenize("Check the tokenizer. It works.")
+        return sent_tokenize
+    except Exception as e:
+        # NLTK resource download failed (e.g. offline)
+        logger.warning(f"NLTK sentence tokenizer unavailable ({e}), using regex fallback")
+        return None
+
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+# Punctuation followed by whitespace; the punctuation stays with its sentence.
+# Same boundaries as splitting on r"(?<=[.!?])\s+", without the slow lookbehind.
+_SENTENCE_BREAK = re.compile(r"[.!?]\s+")
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """
+    A chunk of text and the ``[start, end)`` span of the source it covers.
+    The span excludes the overlap carried over from the previous chunk, and
+    offsets count characters of the source with carriage returns removed.
+    """
+
+    text: str
+    start: int
+    end: int
 
 
 # ============================================================
@@ -35,7 +73,11 @@ except Exception:
 
 
 def split_text_semantic(
-    text: str, chunk_size: int = 800, overlap: int = 150, recursive: bool = True
+    text: str,
+    chunk_size: int = 800,
+    overlap: int = 150,
+    recursive: bool = True,
+    unit: str = "chars",
 ) -> List[str]:
     """
     Main entrypoint for splitting text into semantically meaningful chunks.
@@ -43,30 +85,72 @@ def split_text_semantic(
 
     Args:
         text (str): Input text to split.
-        chunk_size (int): Approximate number of characters per chunk.
-        overlap (int): Overlap between consecutive chunks (in characters).
+        chunk_size (int): Approximate number of characters (or tokens) per chunk.
+        overlap (int): Overlap between consecutive chunks, in the same unit.
         recursive (bool): Whether to recursively split long chunks.
+        unit (str): "chars" or "tokens" (see ``app.utils.tokens``).
 
     Returns:
         List[str]: List of processed text chunks.
     """
-    # Normalize input
-    text = _normalize_text(text)
+    return [
+        chunk.text
+        for chunk in iter_chunks_semantic(text, chunk_size, overlap, recursive, unit=unit)
+    ]
+
+
+def iter_chunks_semantic(
+    source: str | Iterable[str],
+    chunk_size: int = 800,
+    overlap: int = 150,
+    recursive: bool = True,
+    separator: str = "",
+    unit: str = "chars",
+) -> Iterator[TextChunk]:
+    """
+    Streaming version of ``split_text_semantic``: same chunks, yielded one at
+    a time with their source offsets.
 
-    # Split into paragraphs
-    paragraphs = _split_into_paragraphs(text)
+    The input is consumed incrementally, so only the current paragraph tail
+    (down to the last unfinished sentence) and the chunk being built are held
+    in memory, never the whole text or the list of all chunks.
 
-    # Convert paragraphs to chunks (sentence-aware)
-    chunks = _split_paragraphs_into_chunks(paragraphs, chunk_size)
+    Args:
+        source (str | Iterable[str]): Text, or a stream of text pieces such as
+            the pages of a document.
+        chunk_size (int): Approximate number of characters (or tokens) per chunk.
+        overlap (int): Overlap between consecutive chunks, in the same unit.
+        recursive (bool): Whether to recursively split long chunks.
+        separator (str): Inserted between consecutive pieces of a stream
+            (use " " for pages, matching ``load_text``).
+        unit (str): "chars" measures with ``len``; "tokens" measures with the
+            local tokenizer, so chunks fit embedding and prompt token budgets.
+
+    Yields:
+        TextChunk: Each non-empty chunk with its ``start``/``end`` offsets.
+
+    Raises:
+        ValueError: If ``unit`` is unknown or not ``0 <= overlap < chunk_size``.
+    """
+    if unit not in _UNITS:
+        raise ValueError(f"Unsupported chunk unit: {unit}")
+    if not 0 <= overlap < chunk_size:
+        # Long chunks are split with a stride of chunk_size - overlap
+        raise ValueError(
+            f"Chunk overlap must be >= 0 and smaller than the chunk size "
+            f"(got overlap={overlap}, chunk_size={chunk_size})"
+        )
+    measure, offsets = _UNITS[unit]
+
+    pieces = _iter_pieces(source, separator)
+    chunks = _pack_sentences(_iter_sentences(pieces), chunk_size, measure)
 
     # Optionally apply recursive splitting
     if recursive:
-        chunks = _apply_recursive_split(chunks, chunk_size, overlap)
+        chunks = _split_long_chunks(chunks, chunk_size, overlap, measure, offsets)
 
     # Add overlap between chunks for continuity
-    chunks = _apply_overlap(chunks, overlap)
-
-    return [c.strip() for c in chunks if c.strip()]
+    yield from _overlap_chunks(chunks, overlap, offsets)
 
 
 # ============================================================
@@ -74,90 +158,171 @@ def split_text_semantic(
 # ============================================================
 
 
-def _normalize_text(text: str) -> str:
-    """Cleans carriage returns, extra spaces, and trims the text."""
-    return text.strip().replace("\r", "")
+def _iter_pieces(source: str | Iterable[str], separator: str) -> Iterator[str]:
+    """Yields the input pieces with carriage returns removed."""
+    if isinstance(source, str):
+        yield source.replace("\r", "")
+        return
 
+    for index, piece in enumerate(source):
+        if index and separator:
+            yield separator
+        yield piece.replace("\r", "")
 
-def _split_into_paragraphs(text: str) -> List[str]:
-    """
-    Splits text by double newlines or multiple line breaks,
-    preserving logical paragraph boundaries.
-    """
-    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
-    return paragraphs
 
+def _iter_sentences(pieces: Iterable[str]) -> Iterator[tuple[bool, str, int]]:
+    """
+    Splits a text stream into paragraphs (double line breaks) and sentences.
 
-def _split_paragraphs_into_chunks(paragraphs: List[str], chunk_size: int) -> List[str]:
+    Yields ``(starts_paragraph, sentence, offset)``. The last sentence of the
+    buffer is held back until more text arrives, since it may be unfinished.
     """
-    Converts paragraphs into manageable chunks using sentence boundaries.
-    Falls back to regex-based sentence splitting if NLTK is unavailable.
+    buffer, offset = "", 0  # offset: source position of buffer[0]
+    starts_paragraph = True
+
+    for piece in pieces:
+        buffer += piece
+        pos = 0
+        for match in _PARAGRAPH_BREAK.finditer(buffer):
+            paragraph = buffer[pos : match.start()]
+            for sentence, start in _split_sentences(paragraph, offset + pos):
+                yield starts_paragraph, sentence, start
+                starts_paragraph = False
+            starts_paragraph = True
+            pos = match.end()
+
+        spans = _split_sentences(buffer[pos:], offset + pos)
+        for sentence, start in spans[:-1]:
+            yield starts_paragraph, sentence, start
+            starts_paragraph = False
+
+        keep = spans[-1][1] - offset if spans else pos
+        buffer, offset = buffer[keep:], offset + keep
+
+    for sentence, start in _split_sentences(buffer, offset):
+        yield starts_paragraph, sentence, start
+        starts_paragraph = False
+
+
+def _split_sentences(paragraph: str, offset: int) -> list[tuple[str, int]]:
     """
-    chunks = []
-    for para in paragraphs:
-        sentences = _split_into_sentences(para)
-        current_chunk = ""
-
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) + 1 <= chunk_size:
-                current_chunk += (" " if current_chunk else "") + sentence
-            else:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
-
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-    return chunks
-
+    Splits a paragraph into ``(sentence, offset)`` pairs using NLTK or a
+    simple regex fallback. Sentences are slices of the stripped paragraph.
+    """
+    stripped = paragraph.strip()
+    if not stripped:
+        return []
+    offset += paragraph.find(stripped[0])
+
+    spans, pos = [], 0
+    sent_tokenize = _get_sent_tokenize()
+    if sent_tokenize is not None:
+        for sentence in sent_tokenize(stripped):
+            pos = stripped.find(sentence, pos)
+            spans.append((sentence, offset + pos))
+            pos += len(sentence)
+        return spans
 
-def _split_into_sentences(text: str) -> List[str]:
-    """Splits a paragraph into sentences using NLTK or a simple regex fallback."""
-    if NLTK_AVAILABLE:
-        return sent_tokenize(text)
     # Fallback: split by punctuation followed by space or linebreak
-    return re.split(r"(?<=[.!?])\s+", text)
-
-
-def _apply_recursive_split(
-    chunks: List[str], chunk_size: int, overlap: int
-) -> List[str]:
+    for match in _SENTENCE_BREAK.finditer(stripped):
+        spans.append((stripped[pos : match.start() + 1], offset + pos))
+        pos = match.end()
+    spans.append((stripped[pos:], offset + pos))
+    return spans
+
+
+def _pack_sentences(
+    sentences: Iterable[tuple[bool, str, int]],
+    chunk_size: int,
+    measure: Callable[[str], int],
+) -> Iterator[tuple[str, int, int]]:
     """
-    Recursively splits overly large chunks using raw length-based splitting.
+    Groups consecutive sentences of a paragraph into chunks of at most
+    ``chunk_size`` units (one unit per joining space). Yields ``(text, start, end)``.
     """
-    final_chunks = []
-    for chunk in chunks:
-        if len(chunk) > chunk_size * 1.5:
-            sub_chunks = _split_by_length(chunk, chunk_size, overlap)
-            final_chunks.extend(sub_chunks)
+    parts: list[str] = []
+    length = start = end = 0
+
+    for starts_paragraph, sentence, offset in sentences:
+        size = measure(sentence)
+        if starts_paragraph and parts:
+            yield " ".join(parts).strip(), start, end
+            parts, length = [], 0
+
+        if length + size + 1 <= chunk_size:
+            if not parts:
+                start = offset
+            length += size + (1 if parts else 0)
+            parts.append(sentence)
         else:
-            final_chunks.append(chunk)
-    return final_chunks
+            # A sentence longer than the chunk size flushes an empty chunk,
+            # which still receives overlap (kept for output compatibility)
+            if parts:
+                yield " ".join(parts).strip(), start, end
+            else:
+                yield "", offset, offset
+            parts, length, start = [sentence], size, offset
+        end = offset + len(sentence)
+
+    if parts:
+        yield " ".join(parts).strip(), start, end
 
 
-def _split_by_length(text: str, chunk_size: int, overlap: int) -> List[str]:
+def _split_long_chunks(
+    chunks: Iterable[tuple[str, int, int]],
+    chunk_size: int,
+    overlap: int,
+    measure: Callable[[str], int],
+    offsets: Callable[[str], Sequence[int]],
+) -> Iterator[tuple[str, int, int]]:
     """
-    Fallback raw splitter for extremely long text segments.
+    Splits overly large chunks into raw windows of ``chunk_size`` units. Such
+    chunks are always a single sentence, so window offsets map directly to
+    the source.
     """
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = min(start + chunk_size, len(text))
-        chunk = text[start:end]
-        chunks.append(chunk)
-        start += chunk_size - overlap
-    return chunks
-
-
-def _apply_overlap(chunks: List[str], overlap: int) -> List[str]:
+    for text, start, end in chunks:
+        if measure(text) <= chunk_size * 1.5:
+            yield text, start, end
+            continue
+
+        starts = offsets(text)
+        pos = 0
+        while pos < len(starts):
+            begin = starts[pos]
+            end_pos = pos + chunk_size
+            stop = starts[end_pos] if end_pos < len(starts) else len(text)
+            yield text[begin:stop], start + begin, start + stop
+            pos += chunk_size - overlap
+
+
+def _overlap_chunks(
+    chunks: Iterable[tuple[str, int, int]],
+    overlap: int,
+    offsets: Callable[[str], Sequence[int]],
+) -> Iterator[TextChunk]:
     """
-    Applies overlap between consecutive chunks for contextual continuity.
+    Prefixes each chunk with the last ``overlap`` units of the previous
+    (overlapped) chunk for contextual continuity, and drops empty chunks.
     """
-    if overlap <= 0 or len(chunks) <= 1:
-        return chunks
+    tail = None
+    for text, start, end in chunks:
+        if overlap > 0 and tail is not None:
+            text = tail + " " + text
+        if overlap > 0:
+            starts = offsets(text)
+            tail = text[starts[-overlap]:] if len(starts) > overlap else text
+
+        text = text.strip()
+        if text:
+            yield TextChunk(text=text, start=start, end=end)
+
+
+def _char_offsets(text: str) -> range:
+    return range(len(text))
+
 
-    overlapped = [chunks[0]]
-    for i in range(1, len(chunks)):
-        prev_chunk = overlapped[-1]
-        new_chunk = prev_chunk[-overlap:] + " " + chunks[i]
-        overlapped.append(new_chunk)
-    return overlapped
+# unit -> (length function, offsets of each unit in a text)
+_UNITS: dict[str, tuple[Callable[[str], int], Callable[[str], Sequence[int]]]] = {
+    "chars": (len, _char_offsets),
+    "tokens": (count_tokens, token_offsets),
+}
@@ -0,0 +1,90 @@
+"""
+embedding_codec.py
+------------------
+Compact binary encoding of embedding vectors (float32 / float16 / int8).
+
+Layout (little-endian):
+    bytes 0-3  header: format code + 3 reserved bytes (keeps data aligned)
+    bytes 4-7  float32 scale (int8 only)
+    rest       raw vector components
+"""
+
+from __future__ import annotations
+from typing import Sequence
+
+import numpy as np
+
+
+# ============================================================
+#                         Formats
+# ============================================================
+
+FORMATS = {
+    "float32": (1, np.dtype("<f4")),
+    "float16": (2, np.dtype("<f2")),
+    "int8": (3, np.dtype("i1")),
+}
+_BY_CODE = {code: (name, dtype) for name, (code, dtype) in FORMATS.items()}
+_HEADER_SIZE = 4
+_SCALE_SIZE = 4
+
+
+# ============================================================
+#                    Public main functions
+# ============================================================
+
+
+def encode_embedding(vector: Sequence[float], fmt: str = "float32") -> bytes:
+    """
+    Serializes an embedding vector into the compact binary layout.
+
+    Args:
+        vector (Sequence[float]): Embedding vector.
+        fmt (str): "float32" (lossless), "float16" or "int8" (symmetric
+            quantization with a per-vector scale).
+
+    Returns:
+        bytes: Encoded embedding.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported embedding format: {fmt}")
+
+    code, dtype = FORMATS[fmt]
+    values = np.asarray(vector, dtype=np.float32)
+    header = bytes([code, 0, 0, 0])
+
+    if fmt == "int8":
+        peak = float(np.max(np.abs(values))) if values.size else 0.0
+        scale = peak / 127.0 if peak else 1.0
+        quantized = np.clip(np.rint(values / scale), -127, 127).astype(dtype)
+        return header + np.float32(scale).astype("<f4").tobytes() + quantized.tobytes()
+
+    return header + values.astype(dtype).tobytes()
+
+
+def decode_embedding(data: bytes | memoryview) -> np.ndarray:
+    """
+    Decodes an embedding produced by ``encode_embedding``.
+
+    float32 payloads are returned as a zero-copy, read-only view over ``data``
+    (``numpy.frombuffer``); float16 and int8 are widened to float32.
+
+    Returns:
+        np.ndarray: 1-D float32 vector.
+    """
+    fmt, dtype = _BY_CODE[data[0]]
+
+    if fmt == "int8":
+        scale = np.frombuffer(data, dtype="<f4", count=1, offset=_HEADER_SIZE)[0]
+        raw = np.frombuffer(data, dtype=dtype, offset=_HEADER_SIZE + _SCALE_SIZE)
+        return raw.astype(np.float32) * scale
+
+    raw = np.frombuffer(data, dtype=dtype, offset=_HEADER_SIZE)
+    return raw if fmt == "float32" else raw.astype(np.float32)
+
+
+def encoded_size(dim: int, fmt: str = "float32") -> int:
+    """Returns the number of bytes used by an encoded vector of ``dim`` components."""
+    _, dtype = FORMATS[fmt]
+    extra = _SCALE_SIZE if fmt == "int8" else 0
+    return _HEADER_SIZE + extra + dim * dtype.itemsize
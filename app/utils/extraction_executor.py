@@ -0,0 +1,238 @@
+"""
+extraction_executor.py
+----------------------
+Parallel text extraction backed by a process pool.
+
+PyMuPDF page parsing and python-docx DOM building are CPU-bound, so they run
+in worker processes: large PDFs are split into page ranges across workers,
+and batches of files are extracted concurrently. Output order is always the
+input order (pages within a file, files within a batch). PDFs and DOCX
+files already in the extracted-text cache are not parsed again.
+"""
+
+from __future__ import annotations
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.utils.file_loader import (
+    _is_url,
+    cached_digest,
+    iter_pdf_pages,
+    load_text,
+    pdf_page_count,
+)
+from app.utils.text_cache import text_cache
+
+
+@dataclass(frozen=True)
+class ExtractionResult:
+    source: str
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+
+# ============================================================
+#                 Worker-side functions (picklable)
+# ============================================================
+
+
+def _extract_pdf_range(path: str, start: int, stop: int) -> list[tuple[int, str]]:
+    return list(iter_pdf_pages(Path(path), start, stop))
+
+
+def _extract_file(source: str) -> str:
+    return load_text(source)
+
+
+# ============================================================
+#                       Executor
+# ============================================================
+
+
+class ExtractionExecutor:
+    """
+    Process-pool text extractor.
+
+    Args:
+        max_workers (int): Number of worker processes.
+        timeout (float): Per-file timeout in seconds. A task cannot be
+            interrupted, so on a timeout the worker processes are terminated
+            and the pool is replaced (see ``_recycle``).
+        pages_per_task (int): PDF pages extracted by a single task.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        pages_per_task: Optional[int] = None,
+    ):
+        self.max_workers = max_workers or settings.EXTRACTION_WORKERS or os.cpu_count() or 1
+        self.timeout = timeout or settings.EXTRACTION_TIMEOUT
+        self.pages_per_task = pages_per_task or settings.EXTRACTION_PAGES_PER_TASK
+        self._pool = self._new_pool()
+        self._pool_lock = threading.Lock()
+
+    def __enter__(self) -> "ExtractionExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def extract(self, source: str) -> str:
+        """Extracts the normalized text of one file, in parallel for large PDFs."""
+        return " ".join(self.extract_pages(source))
+
+    def extract_pages(self, source: str) -> list[str]:
+        """
+        Extracts the text of one file as its ordered pages (a single page for
+        non-PDF files). Joining them with " " gives ``extract``'s text.
+        """
+        try:
+            return self._collect(source, *self._submit(source))
+        except BrokenProcessPool:
+            # The pool was recycled under us after another file timed out
+            return self._collect(source, *self._submit(source))
+
+    def extract_many(self, sources: list[str]) -> list[ExtractionResult]:
+        """
+        Extracts many files at once. Every file is submitted before waiting,
+        and results (or per-file errors) are returned in input order.
+        """
+        submitted = []
+        for source in sources:
+            try:
+                submitted.append((source, self._submit(source)))
+            except Exception as e:
+                submitted.append((source, e))
+
+        results = []
+        for source, work in submitted:
+            if isinstance(work, Exception):
+                results.append(ExtractionResult(source=source, error=str(work)))
+                continue
+            try:
+                text = " ".join(self._collect(source, *work))
+                results.append(ExtractionResult(source=source, text=text))
+            except Exception as e:
+                results.append(ExtractionResult(source=source, error=str(e)))
+        return results
+
+    def _submit(
+        self, source: str
+    ) -> tuple[Optional[str], tuple[str, ...] | Future | list[Future]]:
+        """
+        Schedules the extraction of one file. Returns its text-cache key and
+        either the cached pages, a single task, or one task per PDF page range.
+        """
+        path = Path(source)
+        if _is_url(source) or path.suffix.lower() != ".pdf":
+            # load_text consults the text cache itself in the worker
+            return None, self._pool.submit(_extract_file, source)
+
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {source}")
+
+        digest = cached_digest(path)
+        if digest is not None:
+            pages = text_cache.get_pages(digest)
+            if pages is not None:
+                return None, tuple(text for _, text in pages)
+
+        page_count = pdf_page_count(path)
+        return digest, [
+            self._pool.submit(_extract_pdf_range, source, start, start + self.pages_per_task)
+            for start in range(0, max(page_count, 1), self.pages_per_task)
+        ]
+
+    def _collect(
+        self,
+        source: str,
+        digest: Optional[str],
+        work: tuple[str, ...] | Future | list[Future],
+    ) -> list[str]:
+        """Waits for a file's tasks within one per-file deadline, in page order."""
+        if isinstance(work, tuple):
+            return list(work)
+
+        try:
+            if isinstance(work, Future):
+                return [work.result(timeout=self.timeout)]
+
+            deadline = time.monotonic() + self.timeout
+            pages: list[tuple[int, str]] = []
+            for future in work:
+                pages.extend(future.result(timeout=max(deadline - time.monotonic(), 0)))
+        except FuturesTimeoutError:
+            self._recycle(work if isinstance(work, list) else [work])
+            raise TimeoutError(
+                f"Extraction of {source} timed out after {self.timeout}s"
+            ) from None
+
+        if digest is not None:
+            text_cache.put_pages(digest, pages)
+        return [text for _, text in pages]
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # "spawn" avoids forking a process that already runs threads
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def _recycle(self, timed_out: list[Future]) -> None:
+        """
+        Replaces the pool whose worker is stuck on a timed-out task and
+        terminates its processes, so hung files cannot pile up until every
+        worker is busy forever. Other tasks still running on the old pool
+        fail with ``BrokenProcessPool`` (``extract`` retries them once).
+        """
+        with self._pool_lock:
+            if not any(future in self._pool_futures(self._pool) for future in timed_out):
+                return  # Already recycled by another caller
+            old, self._pool = self._pool, self._new_pool()
+
+        old.shutdown(wait=False, cancel_futures=True)
+        terminate = getattr(old, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+            return
+        for process in list((old._processes or {}).values()):
+            process.terminate()
+
+    @staticmethod
+    def _pool_futures(pool: ProcessPoolExecutor) -> set[Future]:
+        return {item.future for item in list(pool._pending_work_items.values())}
+
+
+_executor: Optional[ExtractionExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_extraction_executor() -> ExtractionExecutor:
+    """Returns the process-wide executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ExtractionExecutor()
+        return _executor
+
+
+def shutdown_extraction_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -1,31 +1,22 @@
 from __future__ import annotations
+import importlib.util
 import os
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 import mimetypes
 
-# Optional dependencies
-try:
-    import requests
-
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+from app.core.config import settings
+from app.utils.hashing import sha256_file
+from app.utils.text_cache import text_cache
 
-try:
-    import fitz
+# Optional dependencies: only checked here, imported on first use
+REQUESTS_AVAILABLE = importlib.util.find_spec("requests") is not None
+PYMUPDF_AVAILABLE = importlib.util.find_spec("fitz") is not None
+PYDOCX_AVAILABLE = importlib.util.find_spec("docx") is not None
 
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-
-try:
-    import docx
-
-    PYDOCX_AVAILABLE = True
-except ImportError:
-    PYDOCX_AVAILABLE = False
+# Formats whose parsing is expensive enough to go through the text cache
+CACHED_SUFFIXES = (".pdf", ".docx", ".doc")
 
 
 # ============================================================
@@ -54,14 +45,109 @@ def load_text(source: str) -> str:
 
     if path.suffix.lower() in [".txt", ".md"] or (mime_type and "text" in mime_type):
         return _load_text_file(path)
-    elif path.suffix.lower() == ".pdf":
-        return _load_pdf_file(path)
-    elif path.suffix.lower() in [".docx", ".doc"]:
-        return _load_docx_file(path)
+    elif path.suffix.lower() in CACHED_SUFFIXES:
+        return " ".join(text for _, text in _iter_cached_pages(path))
     else:
         raise ValueError(f"Unsupported file format: {path.suffix}")
 
 
+def iter_text(source: str) -> Iterator[tuple[int, str]]:
+    """
+    Streams the normalized text of a file path or URL as ``(page_number, text)``.
+
+    PDFs are yielded page by page, so a huge PDF never has to exist as one
+    giant string; other formats are yielded as a single page numbered 1.
+    Empty pages are skipped.
+
+    Args:
+        source (str): Local file path or HTTP/HTTPS URL.
+
+    Yields:
+        tuple[int, str]: 1-based page number and its normalized text.
+    """
+    path = Path(source)
+    if not _is_url(source) and path.suffix.lower() == ".pdf":
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {source}")
+        yield from _iter_cached_pages(path)
+        return
+
+    text = load_text(source)
+    if text:
+        yield 1, text
+
+
+def iter_pdf_pages(
+    path: Path, start: int = 0, stop: Optional[int] = None
+) -> Iterator[tuple[int, str]]:
+    """
+    Yields ``(page_number, normalized text)`` for each non-empty PDF page,
+    optionally restricted to the 0-based page range ``[start, stop)``.
+    """
+    if not PYMUPDF_AVAILABLE:
+        raise ImportError(
+            "PyMuPDF is required to extract text from PDFs. Run: pip install pymupdf"
+        )
+    import fitz
+
+    with fitz.open(path) as pdf:
+        stop = pdf.page_count if stop is None else min(stop, pdf.page_count)
+        for index in range(start, stop):
+            text = _normalize_text(pdf[index].get_text("text"))
+            if text:
+                yield index + 1, text
+
+
+def pdf_page_count(path: Path) -> int:
+    """Returns the number of pages of a PDF."""
+    if not PYMUPDF_AVAILABLE:
+        raise ImportError(
+            "PyMuPDF is required to extract text from PDFs. Run: pip install pymupdf"
+        )
+    import fitz
+
+    with fitz.open(path) as pdf:
+        return pdf.page_count
+
+
+def cached_digest(path: Path) -> Optional[str]:
+    """
+    Returns the text-cache key of a local file, or None when the file's
+    extracted text is not cached (cache disabled or cheap-to-read format).
+    """
+    if not settings.TEXT_CACHE_ENABLED or path.suffix.lower() not in CACHED_SUFFIXES:
+        return None
+    return sha256_file(path)
+
+
+# ============================================================
+#                  Extracted-text cache
+# ============================================================
+
+def _iter_cached_pages(path: Path) -> Iterator[tuple[int, str]]:
+    """Yields the pages of a PDF/DOCX from the text cache, parsing on a miss."""
+    digest = cached_digest(path)
+    if digest is None:
+        yield from _iter_pages(path)
+        return
+
+    pages = text_cache.get_pages(digest)
+    if pages is None:
+        pages = text_cache.record(digest, _iter_pages(path))
+    yield from pages
+
+
+def _iter_pages(path: Path) -> Iterator[tuple[int, str]]:
+    """Parses a PDF/DOCX into ``(page_number, text)``; a DOCX is one page."""
+    if path.suffix.lower() == ".pdf":
+        yield from iter_pdf_pages(path)
+        return
+
+    text = _load_docx_file(path)
+    if text:
+        yield 1, text
+
+
 # ============================================================
 #                   Loaders by file type
 # ============================================================
@@ -80,11 +166,8 @@ def _load_pdf_file(path: Path) -> str:
             "PyMuPDF is required to extract text from PDFs. Run: pip install pymupdf"
         )
 
-    text = ""
-    with fitz.open(path) as pdf:
-        for page in pdf:
-            text += page.get_text("text") + "\n"
-    return _normalize_text(text)
+    # Per-page normalization + a single join keeps assembly linear
+    return " ".join(text for _, text in iter_pdf_pages(path))
 
 
 def _load_docx_file(path: Path) -> str:
@@ -93,6 +176,7 @@ def _load_docx_file(path: Path) -> str:
         raise ImportError(
             "python-docx is required for DOCX files. Run: pip install python-docx"
         )
+    import docx
 
     doc = docx.Document(path)
     text = "\n".join([para.text for para in doc.paragraphs])
@@ -105,6 +189,7 @@ def _load_from_url(url: str) -> str:
         raise ImportError(
             "Requests library required for URL loading. Run: pip install requests"
         )
+    import requests
 
     response = requests.get(url, timeout=10)
     response.raise_for_status()
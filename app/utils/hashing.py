@@ -0,0 +1,22 @@
+"""
+hashing.py
+----------
+Content hashing helpers.
+"""
+
+import hashlib
+from pathlib import Path
+
+
+def sha256_text(text: str) -> str:
+    """Returns the hex SHA-256 digest of the UTF-8 encoded text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Returns the hex SHA-256 digest of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
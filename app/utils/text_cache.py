@@ -0,0 +1,162 @@
+"""
+text_cache.py
+-------------
+On-disk cache of extracted, normalized document text.
+
+Entries are keyed by the SHA-256 of the source file and ``EXTRACTOR_VERSION``,
+so a file is parsed once no matter where it lives or how often it is
+processed. Each entry is a gzip-compressed NDJSON stream of
+``{"page": n, "text": "..."}`` lines, written and read page by page.
+Entries are evicted least-recently-used first once the directory exceeds
+its size budget.
+"""
+
+from __future__ import annotations
+import gzip
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+# Bump whenever extraction or normalization output changes, so stale
+# entries are ignored (and eventually evicted) instead of served.
+EXTRACTOR_VERSION = 1
+
+
+class TextCache:
+    """
+    Size-bounded LRU cache of extracted pages.
+
+    Args:
+        root (Path): Directory holding the cache entries.
+        max_bytes (int): Budget for the compressed entries on disk.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.v{EXTRACTOR_VERSION}.ndjson.gz"
+
+    # ============================================================
+    #                        Read / write
+    # ============================================================
+
+    def get_pages(self, digest: str) -> Optional[Iterator[tuple[int, str]]]:
+        """
+        Returns a lazy ``(page_number, text)`` iterator for a cached file,
+        or None on a miss. A hit refreshes the entry's LRU position.
+        """
+        path = self._path(digest)
+        try:
+            f = gzip.open(path, "rt", encoding="utf-8")
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._read(f)
+
+    @staticmethod
+    def _read(f) -> Iterator[tuple[int, str]]:
+        with f:
+            for line in f:
+                item = json.loads(line)
+                yield item["page"], item["text"]
+
+    def record(
+        self, digest: str, pages: Iterable[tuple[int, str]]
+    ) -> Iterator[tuple[int, str]]:
+        """
+        Passes ``pages`` through while writing them to the cache. The entry
+        is only published once the iterator is fully consumed, so failed or
+        abandoned extractions never leave partial entries behind.
+        """
+        path = self._path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{uuid.uuid4().hex}.part")
+
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as out:
+                for page, text in pages:
+                    out.write(json.dumps({"page": page, "text": text}, ensure_ascii=False))
+                    out.write("\n")
+                    yield page, text
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        self._account(size)
+
+    def put_pages(self, digest: str, pages: Iterable[tuple[int, str]]) -> None:
+        """Stores already extracted pages."""
+        for _ in self.record(digest, pages):
+            pass
+
+    # ============================================================
+    #                          Eviction
+    # ============================================================
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.glob("*/*.ndjson.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account(self, size: int) -> None:
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._entries())
+            else:
+                self._total += size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Deletes least-recently-used entries until under 90% of the budget."""
+        # Rescan: other processes share the directory, so the running total drifts
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+
+        freed = 0
+        for _, size, path in entries:
+            if total - freed <= target:
+                break
+            path.unlink(missing_ok=True)
+            freed += size
+
+        self._total = total - freed
+        if freed:
+            logger.info(f"Text cache evicted {freed} bytes")
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+text_cache = TextCache(settings.TEXT_CACHE_DIR, settings.TEXT_CACHE_MAX_MB * 1024 * 1024)
@@ -0,0 +1,152 @@
+"""
+tokens.py
+---------
+Offline token counting for chunk sizing and prompt budgets.
+
+Uses the tiktoken encoding of the OpenAI models when its file is already
+in TIKTOKEN_CACHE_DIR, and falls back to a regex approximation (about four
+characters per token) otherwise. tiktoken is never allowed to download the
+file, so token budgets never depend on network access and every process
+with the same files counts the same way. To ship the encoding with the app:
+
+    TIKTOKEN_CACHE_DIR=/path/to/dir python -c "import tiktoken; tiktoken.get_encoding('cl100k_base')"
+"""
+
+from __future__ import annotations
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+# Optional dependency: only checked here, imported on first use
+TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+
+# Fallback: words in pieces of up to four characters, and each punctuation mark
+_APPROX_TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+
+# Where tiktoken downloads each encoding from; its cache file is named after
+# the SHA-1 of this URL
+_ENCODING_URLS = {
+    name: f"https://openaipublic.blob.core.windows.net/encodings/{name}.tiktoken"
+    for name in ("o200k_base", "cl100k_base", "p50k_base", "r50k_base")
+}
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+# Token counts keyed by a 16-byte digest of the text, so the cache is bounded
+# in bytes and does not keep whole sentences and chunks alive
+_COUNT_CACHE_SIZE = 65536
+_counts: "OrderedDict[bytes, int]" = OrderedDict()
+_counts_lock = threading.Lock()
+
+
+# ============================================================
+#                    Public main functions
+# ============================================================
+
+
+def count_tokens(text: str) -> int:
+    """
+    Returns the number of tokens of ``text``. Cached, since the same
+    sentences and chunks are measured repeatedly while packing.
+    """
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _counts_lock:
+        count = _counts.get(key)
+        if count is not None:
+            _counts.move_to_end(key)
+            return count
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        count = len(encoding.encode(text, disallowed_special=()))
+    else:
+        count = sum(1 for _ in _APPROX_TOKEN.finditer(text))
+
+    with _counts_lock:
+        _counts[key] = count
+        if len(_counts) > _COUNT_CACHE_SIZE:
+            _counts.popitem(last=False)
+    return count
+
+
+def token_offsets(text: str) -> list[int]:
+    """Returns the character offset where each token of ``text`` starts."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        _, offsets = encoding.decode_with_offsets(
+            encoding.encode(text, disallowed_special=())
+        )
+        return offsets
+    return [match.start() for match in _APPROX_TOKEN.finditer(text)]
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts ``text`` to its first ``max_tokens`` tokens."""
+    if max_tokens <= 0:
+        return ""
+    offsets = token_offsets(text)
+    if len(offsets) <= max_tokens:
+        return text
+    return text[: offsets[max_tokens]].rstrip()
+
+
+# ============================================================
+#                        Helpers
+# ============================================================
+
+
+def _get_encoding() -> Optional[Any]:
+    """Loads the tiktoken encoding once; None when it cannot be loaded offline."""
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            path = _local_encoding_file(settings.TOKENIZER_ENCODING)
+            if path is None:
+                logger.warning(
+                    f"tiktoken encoding {settings.TOKENIZER_ENCODING} not found in "
+                    f"TIKTOKEN_CACHE_DIR, using approximate token counts"
+                )
+            else:
+                try:
+                    import tiktoken
+
+                    _encoding = tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+                except Exception as e:
+                    logger.warning(
+                        f"tiktoken encoding {settings.TOKENIZER_ENCODING} unavailable "
+                        f"({e}), using approximate token counts"
+                    )
+            _encoding_loaded = True
+    return _encoding
+
+
+def _local_encoding_file(name: str) -> Optional[str]:
+    """
+    Path of the cached encoding file tiktoken would read, or None when it is
+    missing (then ``get_encoding`` would download it, so it is not called).
+    """
+    cache_dir = settings.TIKTOKEN_CACHE_DIR
+    url = _ENCODING_URLS.get(name)
+    if not TIKTOKEN_AVAILABLE or not cache_dir or url is None:
+        return None
+
+    path = os.path.join(cache_dir, hashlib.sha1(url.encode()).hexdigest())
+    if not os.path.isfile(path):
+        return None
+    # tiktoken reads the directory from the environment
+    os.environ["TIKTOKEN_CACHE_DIR"] = cache_dir
+    return path
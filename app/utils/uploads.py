@@ -0,0 +1,166 @@
+"""
+uploads.py
+----------
+Streaming storage of uploaded files under content-addressed paths.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import UploadFile
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size cap."""
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    path: Path
+    sha256: str
+    size: int
+
+
+# ============================================================
+#                    Public main function
+# ============================================================
+
+
+async def save_upload(
+    file: UploadFile, dest_dir: Path, max_bytes: int, chunk_size: int = 1024 * 1024
+) -> StoredUpload:
+    """
+    Copies an upload to ``dest_dir/<sha256><suffix>`` in fixed-size chunks.
+
+    The SHA-256 and the size are computed while copying, so peak memory is
+    one chunk whatever the file size. Identical uploads share the same path
+    instead of overwriting unrelated files with the same name.
+
+    By the time this runs Starlette has already spooled the multipart body,
+    so ``max_bytes`` only rejects the file; the request body itself is capped
+    before it is read by ``UploadSizeLimitMiddleware``.
+
+    Args:
+        file (UploadFile): Incoming upload.
+        dest_dir (Path): Directory where files are stored.
+        max_bytes (int): Size cap of the file.
+        chunk_size (int): Bytes read and written per iteration.
+
+    Returns:
+        StoredUpload: Final path, SHA-256 hex digest and size in bytes.
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds ``max_bytes``.
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    suffix = Path(file.filename or "").suffix.lower()
+    tmp_path = dest_dir / f".upload-{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Upload exceeds the maximum size of {max_bytes} bytes"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+
+        final_path = dest_dir / f"{digest.hexdigest()}{suffix}"
+        os.replace(tmp_path, final_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return StoredUpload(path=final_path, sha256=digest.hexdigest(), size=size)
+
+
+# ============================================================
+#                  Request body size limit
+# ============================================================
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects upload requests whose body exceeds ``max_bytes`` with 413 before
+    the multipart body is parsed and spooled to disk.
+
+    A declared ``Content-Length`` over the limit is refused without reading
+    the body; chunked bodies are counted as they are received and cut off as
+    soon as they cross it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_bytes: int,
+        path_prefixes: tuple[str, ...] = ("/",),
+        methods: tuple[str, ...] = ("POST", "PUT"),
+    ):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = path_prefixes
+        self.methods = methods
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self.methods
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        length = headers.get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLargeError(
+                        f"Request body exceeds the maximum size of {self.max_bytes} bytes"
+                    )
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal started
+            # Once over the limit, the app's own error response is replaced by 413
+            if exceeded and not started:
+                return
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLargeError:
+            if started:
+                raise
+        if exceeded and not started:
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": f"Upload exceeds the maximum size of {self.max_bytes} bytes"},
+            status_code=413,
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,87 @@
+"""
+vector_search.py
+----------------
+Vectorized similarity search over dense embedding matrices (NumPy).
+"""
+
+from __future__ import annotations
+from typing import Sequence
+
+import numpy as np
+
+
+# ============================================================
+#                    Public main functions
+# ============================================================
+
+
+def build_matrix(embeddings: Sequence[Sequence[float]], normalize: bool = True) -> np.ndarray:
+    """
+    Stacks a list of embedding vectors into one contiguous float32 matrix.
+
+    Args:
+        embeddings (Sequence[Sequence[float]]): Embedding vectors of equal length.
+        normalize (bool): Whether to L2-normalize every row, so that a plain
+            dot product with a normalized query equals the cosine similarity.
+
+    Returns:
+        np.ndarray: Matrix of shape (n_vectors, dim) and dtype float32.
+    """
+    if len(embeddings) == 0:
+        return np.empty((0, 0), dtype=np.float32)
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError("All embeddings must have the same dimension.")
+    if normalize:
+        matrix = normalize_rows(matrix)
+    return np.ascontiguousarray(matrix)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalizes each row in place; zero rows are left untouched."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def normalize_vector(vector: Sequence[float]) -> np.ndarray:
+    """Returns the query vector as a float32 unit vector."""
+    query = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    return query / norm if norm else query
+
+
+def top_k(
+    matrix: np.ndarray, query: Sequence[float], k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Scores every row of a normalized matrix against the query with a single
+    matrix-vector product and selects the k best rows.
+
+    A partial selection (``np.argpartition``, O(n)) picks the candidates and
+    only those k are sorted, instead of sorting all n scores.
+
+    Args:
+        matrix (np.ndarray): Row-normalized float32 matrix (see ``build_matrix``).
+        query (Sequence[float]): Query embedding (normalized here).
+        k (int): Number of results to return.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Row indices and cosine scores, best first.
+    """
+    n = matrix.shape[0]
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+
+    scores = matrix @ normalize_vector(query)
+    k = min(k, n)
+
+    if k < n:
+        candidates = np.argpartition(scores, n - k)[n - k :]
+    else:
+        candidates = np.arange(n)
+
+    order = candidates[np.argsort(scores[candidates])[::-1]]
+    return order, scores[order]
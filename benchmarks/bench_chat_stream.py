@@ -0,0 +1,183 @@
+"""
+Benchmark: time to first token of /chat/{chat_id}/ask vs /ask/stream.
+
+Serves the real FastAPI app with uvicorn against a temporary SQLite database
+(one chat linked to one embedded document) and a local fake OpenAI server
+that streams completions with a fixed time to first token and per-token
+delay. Reports when the client first sees answer text and when the answer
+is complete, and checks that the streamed answer is persisted whole.
+
+Usage:
+    python -m benchmarks.bench_chat_stream --first-token 0.5 --tokens 200
+"""
+
+import argparse
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Keep the benchmark away from the persistent embedding cache
+os.environ["TEXT_EMBEDDING_CACHE_ENABLED"] = "false"
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+
+import httpx
+import uvicorn
+from langchain_openai import OpenAIEmbeddings
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.database import get_session
+from app.core.resources import Resources
+from app.domain.chat.models import Chat
+from app.domain.document.models import Document
+from app.domain.document.repository import DocumentRepository
+from app.domain.message.models import Message
+from app.domain.user.models import User
+from app.main import app
+from benchmarks.fake_openai import FakeOpenAIHandler, _fake_vector, fake_openai_server
+
+
+def _seed(engine, chunks: int) -> int:
+    with Session(engine) as session:
+        now = datetime.now(timezone.utc)
+        user = User(
+            username="bench",
+            email="bench@example.com",
+            password="x",
+            created_at=now,
+            updated_at=now,
+        )
+        document = Document(title="bench")
+        session.add_all([user, document])
+        session.commit()
+
+        contents = [f"Section {i}: retrieval augmented generation notes." for i in range(chunks)]
+        vectors = [_fake_vector(json.dumps(c), FakeOpenAIHandler.dim).tolist() for c in contents]
+        DocumentRepository(session).bulk_insert_chunks(document.id, contents, vectors)
+
+        chat = Chat(
+            title="bench", user_id=user.id, document_ids=[document.id], created_at=now
+        )
+        session.add(chat)
+        session.commit()
+        return chat.id
+
+
+def _serve(port: int) -> uvicorn.Server:
+    # lifespan="off": the lifespan would initialise Postgres and start workers
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _ask(client: httpx.Client, chat_id: int) -> tuple[float, str]:
+    start = time.perf_counter()
+    response = client.post(f"/chat/{chat_id}/ask", json={"question": "What is RAG?"})
+    response.raise_for_status()
+    return time.perf_counter() - start, response.json()["answer"]
+
+
+def _ask_stream(client: httpx.Client, chat_id: int) -> tuple[float, float, str, dict]:
+    start = time.perf_counter()
+    first_token = None
+    deltas, done, event = [], {}, None
+    with client.stream(
+        "POST", f"/chat/{chat_id}/ask/stream", json={"question": "What is RAG?"}
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: ") :]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: ") :])
+                if event == "token":
+                    first_token = first_token or time.perf_counter() - start
+                    deltas.append(data["delta"])
+                elif event == "done":
+                    done = data
+                elif event == "error":
+                    raise RuntimeError(data["detail"])
+    return first_token, time.perf_counter() - start, "".join(deltas), done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--first-token", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=50)
+    args = parser.parse_args()
+
+    FakeOpenAIHandler.latency = 0.01
+    FakeOpenAIHandler.first_token_latency = args.first_token
+    FakeOpenAIHandler.token_delay = args.token_delay
+    FakeOpenAIHandler.answer_tokens = args.tokens
+
+    with tempfile.TemporaryDirectory() as tmp, fake_openai_server() as base_url:
+        os.environ["OPENAI_BASE_URL"] = base_url
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        chat_id = _seed(engine, args.chunks)
+
+        def sqlite_session():
+            with Session(engine) as session:
+                yield session
+
+        resources = Resources()
+        # No tiktoken download for context-length checks in the sandbox
+        resources._embeddings = OpenAIEmbeddings(
+            base_url=base_url,
+            check_embedding_ctx_length=False,
+            http_client=resources.http_client,
+        )
+        app.state.resources = resources
+        app.dependency_overrides[get_session] = sqlite_session
+
+        port = _free_port()
+        server = _serve(port)
+        try:
+            with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+                blocking_s, answer = _ask(client, chat_id)
+                first_token_s, stream_s, streamed, done = _ask_stream(client, chat_id)
+        finally:
+            server.should_exit = True
+            resources.close()
+
+        with Session(engine) as session:
+            saved = session.get(Message, done.get("message_id"))
+            assistant_messages = session.exec(
+                select(Message).where(Message.sender == "assistant")
+            ).all()
+
+    print(
+        f"fake completion: {args.first_token * 1000:.0f} ms to first token, "
+        f"{args.tokens} tokens x {args.token_delay * 1000:.0f} ms"
+    )
+    print(f"{'/ask':14}: first text after {blocking_s * 1000:8.0f} ms (whole answer)")
+    print(
+        f"{'/ask/stream':14}: first token after {first_token_s * 1000:8.0f} ms, "
+        f"complete after {stream_s * 1000:.0f} ms"
+    )
+    print(f"same answer: {streamed.strip() == answer}")
+    print(
+        f"persisted whole: {saved is not None and saved.content == answer} "
+        f"({len(assistant_messages)} assistant messages)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: DocumentChunk write throughput (ORM unit of work vs. bulk paths).
+
+Each mode inserts the same synthetic chunks for a temporary document inside
+a transaction that is rolled back afterwards, so the database is left as is.
+
+Usage:
+    python -m benchmarks.bench_chunk_insert --chunks 5000
+    python -m benchmarks.bench_chunk_insert --database-url sqlite:// --chunks 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.config import settings
+from app.domain.document.models import Document, DocumentChunk
+from app.domain.document.repository import DocumentRepository
+from app.domain.job.models import IngestionJob  # noqa: F401 (registers the table)
+from app.utils.embedding_codec import encode_embedding
+
+
+def _orm_insert(session: Session, document_id: int, contents, embeddings) -> None:
+    """Reproduces the former ingestion path: one ORM object per chunk."""
+    for content, embedding in zip(contents, embeddings):
+        session.add(
+            DocumentChunk(
+                document_id=document_id,
+                content=content,
+                embedding=encode_embedding(embedding, settings.EMBEDDING_STORAGE_FORMAT),
+            )
+        )
+    session.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=settings.EMBEDDING_DIM)
+    parser.add_argument("--batch-size", type=int, default=settings.CHUNK_INSERT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name == "sqlite":
+        SQLModel.metadata.create_all(engine)
+
+    rng = np.random.default_rng(0)
+    contents = [f"chunk {i} " + "lorem ipsum dolor sit amet " * 30 for i in range(args.chunks)]
+    embeddings = rng.normal(size=(args.chunks, args.dim)).astype(np.float32).tolist()
+
+    modes = {
+        "orm add/flush": lambda s, d: _orm_insert(s, d, contents, embeddings),
+        "core executemany": lambda s, d: DocumentRepository(s).bulk_insert_chunks(
+            d, contents, embeddings, batch_size=args.batch_size, use_copy=False
+        ),
+    }
+    if engine.dialect.driver == "psycopg2":
+        modes["postgres COPY"] = lambda s, d: DocumentRepository(s).bulk_insert_chunks(
+            d, contents, embeddings, batch_size=args.batch_size, use_copy=True
+        )
+
+    print(f"{args.chunks} chunks x {args.dim} dims on {engine.dialect.name}")
+    for name, write in modes.items():
+        with Session(engine) as session:
+            document = Document(title="bench_chunk_insert")
+            session.add(document)
+            session.flush()
+
+            start = time.perf_counter()
+            write(session, document.id)
+            elapsed = time.perf_counter() - start
+            session.rollback()
+
+        print(f"{name:18}: {elapsed:7.2f} s  {args.chunks / elapsed:10.0f} chunks/s")
+
+
+if __name__ == "__main__":
+    main()
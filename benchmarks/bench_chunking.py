@@ -0,0 +1,158 @@
+"""
+Benchmark: streaming semantic chunker vs the former list-based implementation.
+
+Builds a synthetic multi-page document (paragraphs, short and very long
+sentences, CRLF line endings), checks that ``iter_chunks_semantic`` yields
+exactly the chunks of the former ``split_text_semantic`` (whole text and page
+stream), that every chunk's offsets point at its own content, and reports
+time and peak Python memory (tracemalloc).
+
+Usage:
+    python -m benchmarks.bench_chunking --pages 2000
+"""
+
+import argparse
+import random
+import re
+import time
+import tracemalloc
+
+from app.utils import chunking
+from app.utils.chunking import iter_chunks_semantic
+
+WORDS = (
+    "retrieval augmented generation combines a retriever with a language model "
+    "documents are split into chunks embedded and stored for similarity search"
+).split()
+
+
+# ============================================================
+#        Former implementation (reference for equivalence)
+# ============================================================
+
+
+def _legacy_split(text, chunk_size=800, overlap=150, recursive=True):
+    text = text.strip().replace("\r", "")
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+    chunks = []
+    for para in paragraphs:
+        sent_tokenize = chunking._get_sent_tokenize()
+        if sent_tokenize is not None:
+            sentences = sent_tokenize(para)
+        else:
+            sentences = re.split(r"(?<=[.!?])\s+", para)
+        current_chunk = ""
+        for sentence in sentences:
+            if len(current_chunk) + len(sentence) + 1 <= chunk_size:
+                current_chunk += (" " if current_chunk else "") + sentence
+            else:
+                chunks.append(current_chunk.strip())
+                current_chunk = sentence
+        if current_chunk:
+            chunks.append(current_chunk.strip())
+
+    if recursive:
+        final_chunks = []
+        for chunk in chunks:
+            if len(chunk) > chunk_size * 1.5:
+                start = 0
+                while start < len(chunk):
+                    final_chunks.append(chunk[start : min(start + chunk_size, len(chunk))])
+                    start += chunk_size - overlap
+            else:
+                final_chunks.append(chunk)
+        chunks = final_chunks
+
+    if overlap > 0 and len(chunks) > 1:
+        overlapped = [chunks[0]]
+        for i in range(1, len(chunks)):
+            overlapped.append(overlapped[-1][-overlap:] + " " + chunks[i])
+        chunks = overlapped
+
+    return [c.strip() for c in chunks if c.strip()]
+
+
+# ============================================================
+#                        Benchmark
+# ============================================================
+
+
+def _sentence(rng: random.Random) -> str:
+    # Mostly short sentences, a few longer than 1.5x the chunk size
+    length = rng.choice([5, 12, 20, 30, 60]) if rng.random() > 0.01 else 400
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + rng.choice(".!?")
+
+
+def _build_pages(pages: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(pages):
+        paragraphs = [
+            "  ".join(_sentence(rng) for _ in range(rng.randint(1, 8)))
+            for _ in range(rng.randint(1, 5))
+        ]
+        result.append("\r\n\r\n".join(paragraphs) + rng.choice(["", "\n", "\r\n\r\n"]))
+    return result
+
+
+def _check_offsets(source: str, chunks) -> bool:
+    source = source.replace("\r", "")
+    for chunk in chunks:
+        own = " ".join(source[chunk.start : chunk.end].split())
+        if not " ".join(chunk.text.split()).endswith(own):
+            return False
+    return True
+
+
+def _measure(fn):
+    # Timed and memory-traced separately: tracing slows generators down a lot
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--overlap", type=int, default=150)
+    args = parser.parse_args()
+
+    pages = _build_pages(args.pages)
+    text = "".join(pages)
+    nltk = chunking._get_sent_tokenize() is not None
+    print(f"{args.pages} pages, {len(text) / 1e6:.1f} M chars, NLTK: {nltk}")
+
+    def legacy():
+        return _legacy_split(text, args.chunk_size, args.overlap)
+
+    def streamed_text():
+        return [c.text for c in iter_chunks_semantic(text, args.chunk_size, args.overlap)]
+
+    def streamed_pages():
+        # Only the chunk count is kept, as an ingestion consumer would
+        return sum(1 for _ in iter_chunks_semantic(iter(pages), args.chunk_size, args.overlap))
+
+    reference, legacy_s, legacy_peak = _measure(legacy)
+    from_text, text_s, text_peak = _measure(streamed_text)
+    count, pages_s, pages_peak = _measure(streamed_pages)
+
+    chunks = list(iter_chunks_semantic(iter(pages), args.chunk_size, args.overlap))
+    print(f"{'legacy lists':22}: {legacy_s:7.2f} s  peak {legacy_peak / 1e6:8.1f} MB")
+    print(f"{'iter_chunks (text)':22}: {text_s:7.2f} s  peak {text_peak / 1e6:8.1f} MB")
+    print(f"{'iter_chunks (pages)':22}: {pages_s:7.2f} s  peak {pages_peak / 1e6:8.1f} MB")
+    print(f"chunks: {len(reference)}")
+    print(f"identical (text): {from_text == reference}")
+    print(f"identical (pages): {[c.text for c in chunks] == reference and count == len(reference)}")
+    print(f"offsets valid: {_check_offsets(text, chunks)}")
+
+
+if __name__ == "__main__":
+    main()
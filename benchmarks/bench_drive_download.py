@@ -0,0 +1,122 @@
+"""
+Benchmark: serial vs concurrent Drive downloads (``DocumentService``).
+
+Downloads a set of files from a local fake Drive server with a fixed
+latency per request, first with one worker (the previous serial loop) and
+then with a bounded pool, for a couple of ``MediaIoBaseDownload`` chunk
+sizes. Every downloaded file is checked against its MD5, and a missing file
+is included to show that per-file errors are reported, not raised.
+
+Then repeats the download through a local Drive mirror: cold, warm (files
+unchanged on Drive are not fetched again), after one file changed, and
+with a mirror budget smaller than the files to show eviction.
+
+Usage:
+    python -m benchmarks.bench_drive_download --files 20 --file-kb 2048 --workers 8
+"""
+
+import argparse
+import hashlib
+import tempfile
+import time
+from pathlib import Path
+
+from app.domain.drive.mirror import DriveMirror
+from app.domain.rag.document_service import DocumentService
+from benchmarks.fake_drive import FakeDrive, FakeDriveHandler, fake_drive_server, make_files
+
+
+def _metadata(include_missing: bool = True) -> list[dict]:
+    files = [
+        {k: v for k, v in f.items() if k != "content"} for f in FakeDriveHandler.files.values()
+    ]
+    if include_missing:
+        files.append({"id": "missing", "name": "missing.txt", "mimeType": "text/plain"})
+    return files
+
+
+def _run(drive: FakeDrive, files: list[dict], workers: int, chunk_size: int):
+    service = DocumentService(drive, max_workers=workers, chunk_size=chunk_size)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        results = service.download_documents(files, Path(tmp))
+        elapsed = time.perf_counter() - start
+        corrupt = [
+            r.file_id
+            for r in results
+            if r.path is not None
+            and hashlib.md5(r.path.read_bytes()).hexdigest()
+            != FakeDriveHandler.files[r.file_id]["md5Checksum"]
+        ]
+    return elapsed, results, corrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--file-kb", type=int, default=2048)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--chunk-kb", default="256,102400")
+    args = parser.parse_args()
+
+    FakeDriveHandler.files = make_files(args.files, args.file_kb * 1024)
+    FakeDriveHandler.latency = args.latency
+    files = _metadata()
+
+    print(
+        f"{args.files} files x {args.file_kb} KB (+1 missing), "
+        f"{args.latency * 1000:.0f} ms per Drive request"
+    )
+    with fake_drive_server() as url:
+        drive = FakeDrive(url)
+        for chunk_kb in [int(c) for c in args.chunk_kb.split(",")]:
+            serial_s, _, _ = _run(drive, files, 1, chunk_kb * 1024)
+            parallel_s, results, corrupt = _run(drive, files, args.workers, chunk_kb * 1024)
+            errors = [r for r in results if r.error]
+            print(
+                f"chunk {chunk_kb:>6} KB: serial {serial_s:6.2f} s, "
+                f"{args.workers} workers {parallel_s:6.2f} s "
+                f"({serial_s / parallel_s:.1f}x); "
+                f"ok {len(results) - len(errors)}, errors {len(errors)}, corrupt {len(corrupt)}"
+            )
+        for r in errors:
+            print(f"  {r.file_id}: {r.error[:80]}")
+
+        print("\nmirror (default chunk size):")
+        with tempfile.TemporaryDirectory() as tmp:
+            mirror = DriveMirror(Path(tmp), 1 << 40)
+            drive = FakeDrive(url, mirror=mirror)
+            _mirror_step("cold", drive, _metadata(False), args.workers)
+            _mirror_step("warm", drive, _metadata(False), args.workers)
+
+            changed = FakeDriveHandler.files["doc0000"]
+            changed["content"] = b"edited " + changed["content"]
+            changed["md5Checksum"] = hashlib.md5(changed["content"]).hexdigest()
+            changed["modifiedTime"] = "2024-02-01T00:00:00.000Z"
+            _mirror_step("1 changed", drive, _metadata(False), args.workers)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            budget = args.files * args.file_kb * 1024 // 2
+            mirror = DriveMirror(Path(tmp), budget)
+            drive = FakeDrive(url, mirror=mirror)
+            _mirror_step("half budget", drive, _metadata(False), args.workers)
+            stats = mirror.stats()
+            print(
+                f"  mirrored {stats['entries']} files, {stats['bytes'] // 1024} KB "
+                f"(budget {budget // 1024} KB)"
+            )
+
+
+def _mirror_step(label: str, drive: FakeDrive, files: list[dict], workers: int) -> None:
+    before = FakeDriveHandler.media_requests
+    elapsed, results, corrupt = _run(drive, files, workers, 100 * 1024 * 1024)
+    errors = [r for r in results if r.error]
+    print(
+        f"  {label:12}: {elapsed:6.2f} s, {FakeDriveHandler.media_requests - before:3} "
+        f"file downloads; ok {len(results) - len(errors)}, corrupt {len(corrupt)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: Drive file listing through the API (/drive/files and the NDJSON
+/drive/files/stream), against a local fake Drive with many files.
+
+Shows how many files a single ``files().list`` call (the previous
+implementation) returns, then the paginated listing cold, served from the
+listing cache, streamed after invalidating the cache (time to the first
+NDJSON line vs the whole listing), and the number of Drive list requests
+each step made.
+
+Usage:
+    python -m benchmarks.bench_drive_listing --files 5000 --latency 0.2
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+
+import httpx
+
+from app.core.resources import Resources
+from app.main import app
+from app.routers.drive import DOCUMENT_MIME_TYPES
+from benchmarks.bench_chat_stream import _free_port, _serve
+from benchmarks.fake_drive import FakeDrive, FakeDriveHandler, fake_drive_server, make_files
+
+
+def _step(label: str, fn) -> None:
+    before = FakeDriveHandler.list_requests
+    start = time.perf_counter()
+    detail = fn(start)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:22}: {elapsed * 1000:7.0f} ms, "
+        f"{FakeDriveHandler.list_requests - before:2} list requests; {detail}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    FakeDriveHandler.files = make_files(args.files, 64)
+    FakeDriveHandler.latency = args.latency
+    print(f"{args.files} files on the fake Drive, {args.latency * 1000:.0f} ms per request")
+
+    with fake_drive_server() as drive_url:
+        drive = FakeDrive(drive_url)
+        resources = Resources()
+        resources._drive = drive
+        app.state.resources = resources
+
+        port = _free_port()
+        server = _serve(port)
+        try:
+            with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=120) as client:
+
+                def single_call(_):
+                    query = " or ".join(f"mimeType='{m}'" for m in DOCUMENT_MIME_TYPES)
+                    files = drive.service.files().list(q=query).execute()["files"]
+                    return f"{len(files)} files (truncated: {len(files) < args.files})"
+
+                def listing(_):
+                    body = client.get("/drive/files").json()
+                    return f"{body['total']} files"
+
+                def stream(start):
+                    first, count = None, 0
+                    with client.stream("GET", "/drive/files/stream") as response:
+                        for line in response.iter_lines():
+                            if line:
+                                json.loads(line)
+                                first = first or time.perf_counter() - start
+                                count += 1
+                    return f"{count} files, first line after {first * 1000:.0f} ms"
+
+                _step("single files().list", single_call)
+                _step("/drive/files cold", listing)
+                _step("/drive/files cached", listing)
+                invalidated = client.delete("/drive/files/cache").json()["invalidated"]
+                print(f"invalidated {invalidated} cached listing(s)")
+                _step("/drive/files/stream", stream)
+                _step("/drive/files/stream cached", stream)
+        finally:
+            server.should_exit = True
+            resources.close()
+
+
+if __name__ == "__main__":
+    main()
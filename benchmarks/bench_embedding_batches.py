@@ -0,0 +1,65 @@
+"""
+Benchmark: serial per-chunk embedding vs. batched, concurrent embedding.
+
+Runs EmbeddingService against a local fake embedding server with a fixed
+per-request latency, so only client-side request scheduling is measured.
+
+Usage:
+    python -m benchmarks.bench_embedding_batches --chunks 500 --latency 0.05
+"""
+
+import argparse
+import os
+import time
+
+from langchain_openai import OpenAIEmbeddings
+
+from app.domain.rag.embedding_service import EmbeddingService
+from benchmarks.fake_openai import FakeOpenAIHandler, fake_openai_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    FakeOpenAIHandler.latency = args.latency
+    texts = [f"chunk number {i} " * 20 for i in range(args.chunks)]
+
+    with fake_openai_server() as base_url:
+        os.environ.setdefault("OPENAI_API_KEY", "fake")
+        svc = EmbeddingService(
+            OpenAIEmbeddings(
+                base_url=base_url, api_key="fake", check_embedding_ctx_length=False
+            )
+        )
+        # Measure request scheduling only, not the persistent embedding cache
+        svc.cache = None
+
+        start = time.perf_counter()
+        serial = [svc.embed_text(t) for t in texts]
+        serial_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = svc.embed_texts(
+            texts, batch_size=args.batch_size, max_concurrency=args.concurrency
+        )
+        batched_s = time.perf_counter() - start
+
+    same = all(
+        max(abs(a - b) for a, b in zip(x, y)) < 1e-6 for x, y in zip(serial, batched)
+    )
+    print(f"{args.chunks} chunks, {args.latency * 1000:.0f} ms per request")
+    print(f"serial embed_text   : {serial_s:8.2f} s")
+    print(
+        f"embed_texts (b={args.batch_size}, c={args.concurrency}): {batched_s:8.2f} s"
+    )
+    print(f"speed-up            : {serial_s / batched_s:8.1f}x")
+    print(f"same vectors, same order: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: size, decode time and recall of the embedding storage formats.
+
+Compares the former JSON text encoding with the binary float32, float16 and
+int8 formats of app.utils.embedding_codec, to pick EMBEDDING_STORAGE_FORMAT.
+
+Usage:
+    python -m benchmarks.bench_embedding_storage --chunks 20000 --dim 1536
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+
+from app.utils.embedding_codec import FORMATS, decode_embedding, encode_embedding
+from app.utils.vector_search import build_matrix, top_k
+
+
+def _recall(exact: np.ndarray, approx: np.ndarray, queries: np.ndarray, k: int) -> float:
+    hits = []
+    for query in queries:
+        expected = set(top_k(exact, query, k)[0].tolist())
+        found = set(top_k(approx, query, k)[0].tolist())
+        hits.append(len(expected & found) / k)
+    return statistics.mean(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(args.chunks, args.dim)).astype(np.float32)
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+    exact = build_matrix(vectors)
+
+    payloads = [json.dumps(v) for v in vectors.tolist()]
+    start = time.perf_counter()
+    build_matrix([json.loads(p) for p in payloads])
+    json_ms = (time.perf_counter() - start) * 1000
+    json_bytes = statistics.mean(len(p.encode()) for p in payloads)
+
+    print(f"{args.chunks} vectors x {args.dim} dims, recall@{args.top_k}")
+    print(f"{'format':8} {'bytes/vec':>10} {'decode+stack':>14} {'recall':>8}")
+    print(f"{'json':8} {json_bytes:10.0f} {json_ms:11.1f} ms {1.0:8.3f}")
+
+    for fmt in FORMATS:
+        blobs = [encode_embedding(v, fmt) for v in vectors]
+        start = time.perf_counter()
+        matrix = build_matrix([decode_embedding(b) for b in blobs])
+        decode_ms = (time.perf_counter() - start) * 1000
+        recall = _recall(exact, matrix, queries, args.top_k)
+        print(f"{fmt:8} {len(blobs[0]):10d} {decode_ms:11.1f} ms {recall:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: PDF text extraction on a synthetic large PDF.
+
+Compares the former ``text += page`` + whole-document ``re.sub`` loader with
+the linear ``_load_pdf_file`` and with streaming ``iter_pdf_pages``, reporting
+time and peak Python memory (tracemalloc).
+
+Usage:
+    python -m benchmarks.bench_pdf_extraction --pages 1000
+"""
+
+import argparse
+import re
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import fitz
+
+from app.utils.file_loader import _load_pdf_file, iter_pdf_pages
+
+PARAGRAPH = (
+    "Retrieval-augmented generation combines a retriever with a language model. "
+    "Each   page of this synthetic document repeats the same paragraph\n\n"
+    "with irregular   whitespace so normalization has work to do. "
+)
+
+
+def _build_pdf(path: Path, pages: int) -> None:
+    with fitz.open() as pdf:
+        for number in range(pages):
+            page = pdf.new_page()
+            page.insert_textbox(
+                fitz.Rect(40, 40, 560, 800), f"Page {number + 1}. " + PARAGRAPH * 12
+            )
+        pdf.save(path)
+
+
+def _legacy_load(path: Path) -> str:
+    """The original _load_pdf_file implementation."""
+    text = ""
+    with fitz.open(path) as pdf:
+        for page in pdf:
+            text += page.get_text("text") + "\n"
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _stream(path: Path) -> int:
+    return sum(len(text) for _, text in iter_pdf_pages(path))
+
+
+def _measure(fn, path: Path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.pdf"
+        _build_pdf(path, args.pages)
+        print(f"{args.pages}-page PDF, {path.stat().st_size / 1e6:.1f} MB")
+
+        legacy, legacy_s, legacy_peak = _measure(_legacy_load, path)
+        linear, linear_s, linear_peak = _measure(_load_pdf_file, path)
+        streamed, stream_s, stream_peak = _measure(_stream, path)
+
+    print(f"{'legacy +=':18}: {legacy_s:7.2f} s  peak {legacy_peak / 1e6:8.1f} MB")
+    print(f"{'_load_pdf_file':18}: {linear_s:7.2f} s  peak {linear_peak / 1e6:8.1f} MB")
+    print(f"{'iter_pdf_pages':18}: {stream_s:7.2f} s  peak {stream_peak / 1e6:8.1f} MB")
+    print(f"identical output: {legacy == linear}, streamed chars: {streamed}")
+
+
+if __name__ == "__main__":
+    main()
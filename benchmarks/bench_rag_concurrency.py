@@ -0,0 +1,144 @@
+"""
+Concurrency test: N simultaneous Drive RAG pipelines (``RagService.run_pipeline``).
+
+Each run asks over its own set of files served by a local fake Drive, with
+embeddings and completions from a local fake OpenAI server and messages
+stored in a temporary SQLite database. The FAISS index store is disabled
+so every run downloads and indexes its files. The test checks that every
+index contains exactly the files of its own run (no file of a concurrent
+run leaking in, none deleted underneath it) and that no workspace is left
+behind, and compares wall-clock time against running the same pipelines
+one after another.
+
+Usage:
+    python -m benchmarks.bench_rag_concurrency --runs 8 --files-per-run 3
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["RAG_WORKSPACE_DIR"] = str(Path(_tmp.name) / "runs")
+os.environ["FAISS_INDEX_CACHE_ENABLED"] = "false"
+os.environ["TEXT_EMBEDDING_CACHE_ENABLED"] = "false"
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+
+from langchain_openai import OpenAIEmbeddings
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.config import settings
+from app.core.resources import Resources
+from app.domain.rag.embedding_service import EmbeddingService
+from app.domain.rag.service import RagService
+from benchmarks.bench_chat_stream import _seed
+from benchmarks.fake_drive import FakeDrive, FakeDriveHandler, fake_drive_server, make_files
+from benchmarks.fake_openai import FakeOpenAIHandler, fake_openai_server
+
+_run = threading.local()
+_mismatches: list[str] = []
+_create_embeddings = EmbeddingService.create_embeddings
+
+
+def _checked_create_embeddings(self, docs_path: Path):
+    """Records runs whose index does not hold exactly their own files."""
+    db = _create_embeddings(self, docs_path)
+    sources = {Path(doc.metadata["source"]).name for doc in db.docstore._dict.values()}
+    if sources != _run.expected:
+        _mismatches.append(
+            f"run {_run.name}: indexed {sorted(sources)}, expected {sorted(_run.expected)}"
+        )
+    return db
+
+
+def _pipeline(engine, resources: Resources, chat_id: int, name: int, files: list[dict]):
+    _run.name = name
+    _run.expected = {f["name"] for f in files}
+    with Session(engine) as session:
+        result = RagService(session, resources).run_pipeline(
+            chat_id, "What is this about?", [f["id"] for f in files]
+        )
+    return result["bot_message"].content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=8)
+    parser.add_argument("--files-per-run", type=int, default=3)
+    parser.add_argument("--file-kb", type=int, default=20)
+    parser.add_argument("--drive-latency", type=float, default=0.05)
+    parser.add_argument("--openai-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    files = make_files(args.runs * args.files_per_run, args.file_kb * 1024)
+    FakeDriveHandler.files = files
+    FakeDriveHandler.latency = args.drive_latency
+    FakeOpenAIHandler.latency = args.openai_latency
+    FakeOpenAIHandler.first_token_latency = args.openai_latency
+    FakeOpenAIHandler.token_delay = 0
+    FakeOpenAIHandler.answer_tokens = 20
+    EmbeddingService.create_embeddings = _checked_create_embeddings
+
+    file_list = list(files.values())
+    run_files = [
+        file_list[i * args.files_per_run : (i + 1) * args.files_per_run]
+        for i in range(args.runs)
+    ]
+
+    with _tmp, fake_drive_server() as drive_url, fake_openai_server() as openai_url:
+        os.environ["OPENAI_BASE_URL"] = openai_url
+        engine = create_engine(
+            f"sqlite:///{Path(_tmp.name) / 'bench.db'}", connect_args={"timeout": 60}
+        )
+        SQLModel.metadata.create_all(engine)
+        chat_id = _seed(engine, 1)
+
+        resources = Resources()
+        resources._drive = FakeDrive(drive_url)
+        # No tiktoken download for context-length checks in the sandbox
+        resources._embeddings = OpenAIEmbeddings(
+            base_url=openai_url,
+            check_embedding_ctx_length=False,
+            http_client=resources.http_client,
+        )
+
+        def run_all(workers: int) -> tuple[float, list[str]]:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                answers = list(
+                    pool.map(
+                        lambda i: _pipeline(engine, resources, chat_id, i, run_files[i]),
+                        range(args.runs),
+                    )
+                )
+            return time.perf_counter() - start, answers
+
+        try:
+            sequential_s, _ = run_all(1)
+            concurrent_s, answers = run_all(args.runs)
+        finally:
+            resources.close()
+
+        workspace_root = Path(settings.RAG_WORKSPACE_DIR)
+        leftovers = list(workspace_root.iterdir()) if workspace_root.exists() else []
+
+    print(
+        f"{args.runs} pipelines x {args.files_per_run} files of {args.file_kb} KB "
+        f"(Drive {args.drive_latency * 1000:.0f} ms, OpenAI {args.openai_latency * 1000:.0f} ms "
+        f"per request)"
+    )
+    print(f"sequential : {sequential_s:6.2f} s")
+    print(f"concurrent : {concurrent_s:6.2f} s ({sequential_s / concurrent_s:.1f}x)")
+    print(f"answers    : {sum(1 for a in answers if a)}/{args.runs}")
+    print(f"isolated   : {not _mismatches}")
+    for mismatch in _mismatches:
+        print(f"  {mismatch}")
+    print(f"workspaces left behind: {len(leftovers)}")
+
+
+if __name__ == "__main__":
+    main()
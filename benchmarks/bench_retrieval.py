@@ -0,0 +1,60 @@
+"""
+Benchmark: per-chunk cosine loop vs. vectorized NumPy top-k retrieval.
+
+Usage:
+    python -m benchmarks.bench_retrieval --chunks 20000 --dim 1536 --top-k 5
+"""
+
+import argparse
+import random
+import time
+
+from app.utils.similiraty import cosine_similarity
+from app.utils.vector_search import build_matrix, top_k
+
+
+def _random_vectors(n: int, dim: int, seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    return [[rng.uniform(-1.0, 1.0) for _ in range(dim)] for _ in range(n)]
+
+
+def _loop_top_k(query: list[float], vectors: list[list[float]], k: int) -> list[int]:
+    """Reproduces the original ChatService.ask scoring loop."""
+    scored = [(cosine_similarity(query, v), i) for i, v in enumerate(vectors)]
+    return [i for _, i in sorted(scored, key=lambda x: x[0], reverse=True)[:k]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Generating {args.chunks} x {args.dim} embeddings...")
+    vectors = _random_vectors(args.chunks, args.dim, seed=0)
+    queries = _random_vectors(args.queries, args.dim, seed=1)
+
+    start = time.perf_counter()
+    expected = [_loop_top_k(q, vectors, args.top_k) for q in queries]
+    loop_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    start = time.perf_counter()
+    matrix = build_matrix(vectors)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    results = [top_k(matrix, q, args.top_k)[0].tolist() for q in queries]
+    numpy_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    agree = sum(e == r for e, r in zip(expected, results))
+    print(f"per-chunk loop : {loop_ms:10.2f} ms/query")
+    print(f"matrix build   : {build_ms:10.2f} ms (once per document set)")
+    print(f"numpy top-k    : {numpy_ms:10.2f} ms/query")
+    print(f"speed-up       : {loop_ms / max(numpy_ms, 1e-9):10.1f}x")
+    print(f"identical top-{args.top_k}: {agree}/{args.queries} queries")
+
+
+if __name__ == "__main__":
+    main()
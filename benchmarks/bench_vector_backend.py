@@ -0,0 +1,124 @@
+"""
+Benchmark: latency and recall of the pgvector backend vs. the Python backend.
+
+Needs the configured Postgres database with the pgvector migration applied
+(``alembic upgrade head`` on a server providing the ``vector`` extension).
+A large and a small synthetic document are inserted, queried through both
+backends and deleted. Recall is measured over both documents and with a
+selective filter on the small one only, where the ANN index must keep
+scanning past the large document's rows to find ``top_k`` matches.
+
+Usage:
+    python -m benchmarks.bench_vector_backend --chunks 20000 --small-chunks 200 --queries 50
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.domain.document.matrix_cache import matrix_cache
+from app.domain.document.models import Document, DocumentChunk
+from app.domain.document.repository import DocumentRepository
+from app.domain.document.retrieval_service import RetrievalService
+from app.utils.embedding_codec import encode_embedding
+
+
+def _insert_document(session: Session, vectors: np.ndarray) -> int:
+    document = Document(title="bench_vector_backend")
+    session.add(document)
+    session.flush()
+
+    chunks = [
+        DocumentChunk(
+            document_id=document.id,
+            content=f"chunk {i}",
+            embedding=encode_embedding(v, settings.EMBEDDING_STORAGE_FORMAT),
+        )
+        for i, v in enumerate(vectors)
+    ]
+    session.add_all(chunks)
+    session.flush()
+    DocumentRepository(session).store_chunk_vectors(
+        [(c.id, v.tolist()) for c, v in zip(chunks, vectors)]
+    )
+    session.commit()
+    return document.id
+
+
+def _timed(fn) -> tuple[list, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--small-chunks", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(args.chunks, settings.EMBEDDING_DIM)).astype(np.float32)
+    small = rng.normal(size=(args.small_chunks, settings.EMBEDDING_DIM)).astype(np.float32)
+    queries = rng.normal(size=(args.queries, settings.EMBEDDING_DIM)).astype(np.float32)
+
+    with Session(engine) as session:
+        document_id = _insert_document(session, vectors)
+        small_id = _insert_document(session, small)
+        scenarios = {"all documents": [document_id, small_id], "selective": [small_id]}
+        try:
+            svc = RetrievalService(session)
+            latencies = {"python (cold)": [], "python (cached)": [], "pgvector": []}
+            recalls = {name: [] for name in scenarios}
+            short = {name: 0 for name in scenarios}
+
+            for query in queries.tolist():
+                for name, document_ids in scenarios.items():
+                    for i in document_ids:
+                        matrix_cache.invalidate(i)
+                    settings.VECTOR_BACKEND = "python"
+                    exact, ms = _timed(lambda: svc.search(document_ids, query, args.top_k))
+                    latencies["python (cold)"].append(ms)
+                    _, ms = _timed(lambda: svc.search(document_ids, query, args.top_k))
+                    latencies["python (cached)"].append(ms)
+
+                    settings.VECTOR_BACKEND = "pgvector"
+                    approx, ms = _timed(lambda: svc.search(document_ids, query, args.top_k))
+                    latencies["pgvector"].append(ms)
+                    session.commit()  # end the transaction (scan settings are local)
+
+                    expected = {content for _, content in exact}
+                    recalls[name].append(
+                        len(expected & {c for _, c in approx}) / max(len(expected), 1)
+                    )
+                    short[name] += len(approx) < args.top_k
+        finally:
+            for i in (document_id, small_id):
+                session.delete(session.get(Document, i))
+            session.commit()
+
+    print(
+        f"{args.chunks} + {args.small_chunks} chunks x {settings.EMBEDDING_DIM} dims, "
+        f"top-{args.top_k}"
+    )
+    for name, values in latencies.items():
+        print(
+            f"{name:16}: p50 {statistics.median(values):8.2f} ms   "
+            f"max {max(values):8.2f} ms"
+        )
+    for name in scenarios:
+        print(
+            f"pgvector recall@{args.top_k} ({name}): {statistics.mean(recalls[name]):.3f}, "
+            f"{short[name]}/{args.queries} queries with fewer than {args.top_k} rows"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Minimal local stand-in for the Google Drive v3 API, used by the benchmarks.
+
+Serves paginated listings (``GET /files`` with ``q`` mimeType filters,
+``pageSize`` and ``pageToken``), file metadata (``GET /files/{id}``) and
+contents (``GET /files/{id}?alt=media``, with the ``Range`` requests issued
+by ``MediaIoBaseDownload``) after a fixed artificial latency per request, for
+an in-memory set of files. ``FakeDrive`` is a ``DriveService`` whose
+per-thread ``googleapiclient`` resource points at the fake server.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from app.domain.drive.mirror import DriveMirror
+from app.domain.drive.service import DriveService
+
+
+class FakeDriveHandler(BaseHTTPRequestHandler):
+    latency: float = 0.05  # per request
+    files: dict[str, dict] = {}  # id -> metadata, including the "content" bytes
+    requests: int = 0
+    media_requests: int = 0
+    list_requests: int = 0
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict = {}):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        type(self).requests += 1
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.endswith("/files"):
+            return self._list(query)
+        match = re.fullmatch(r".*/files/([^/]+)", url.path)
+        file = self.files.get(match.group(1)) if match else None
+        if file is None:
+            body = json.dumps({"error": {"code": 404, "message": "File not found"}})
+            return self._send(404, body.encode(), "application/json")
+
+        if query.get("alt") == ["media"]:
+            type(self).media_requests += 1
+            return self._media(file["content"])
+
+        metadata = {k: v for k, v in file.items() if k != "content"}
+        self._send(200, json.dumps(metadata).encode(), "application/json")
+
+    def _list(self, query: dict):
+        type(self).list_requests += 1
+        mime_types = set(re.findall(r"mimeType='([^']+)'", query.get("q", [""])[0]))
+        files = [
+            {k: v for k, v in f.items() if k != "content"}
+            for f in self.files.values()
+            if not mime_types or f["mimeType"] in mime_types
+        ]
+        # Same paging rules as Drive: 100 by default, at most 1000
+        page_size = min(int(query.get("pageSize", ["100"])[0]), 1000)
+        start = int(query.get("pageToken", ["0"])[0])
+        payload = {"files": files[start : start + page_size]}
+        if start + page_size < len(files):
+            payload["nextPageToken"] = str(start + page_size)
+        self._send(200, json.dumps(payload).encode(), "application/json")
+
+    def _media(self, content: bytes):
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if not match:
+            return self._send(200, content, "application/octet-stream")
+
+        start = int(match.group(1))
+        end = min(int(match.group(2) or len(content) - 1), len(content) - 1)
+        self._send(
+            206,
+            content[start : end + 1],
+            "application/octet-stream",
+            {"Content-Range": f"bytes {start}-{end}/{len(content)}"},
+        )
+
+
+class _FakeServer(ThreadingHTTPServer):
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def make_files(count: int, size: int, prefix: str = "doc") -> dict[str, dict]:
+    """Builds ``count`` distinct text files of about ``size`` bytes each."""
+    files = {}
+    for i in range(count):
+        file_id = f"{prefix}{i:04d}"
+        sentence = f"{file_id} is about topic number {i} of the fake drive. "
+        content = (sentence * (size // len(sentence) + 1))[:size].encode()
+        files[file_id] = {
+            "id": file_id,
+            "name": f"{file_id}.txt",
+            "mimeType": "text/plain",
+            "modifiedTime": "2024-01-01T00:00:00.000Z",
+            "md5Checksum": hashlib.md5(content).hexdigest(),
+            "size": str(len(content)),
+            "content": content,
+        }
+    return files
+
+
+@contextmanager
+def fake_drive_server(handler: type = FakeDriveHandler):
+    """Runs the fake API on a free local port and yields its base URL."""
+    server = _FakeServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class FakeDrive(DriveService):
+    """``DriveService`` talking to the fake server, without OAuth."""
+
+    def __init__(self, base_url: str, mirror: Optional[DriveMirror] = None):
+        self.base_url = base_url
+        self.creds = None
+        self._local = threading.local()
+        self._listings = {}
+        self._listing_lock = threading.Lock()
+        self.mirror = mirror
+
+    @property
+    def service(self):
+        if getattr(self._local, "service", None) is None:
+            import httplib2
+            from googleapiclient.discovery import build
+
+            self._local.service = build(
+                "drive",
+                "v3",
+                http=httplib2.Http(),
+                static_discovery=True,
+                client_options={"api_endpoint": self.base_url},
+            )
+        return self._local.service
@@ -0,0 +1,152 @@
+"""
+Minimal local stand-in for the OpenAI HTTP API, used by the benchmarks.
+
+Serves ``POST /v1/embeddings`` with deterministic vectors after a fixed
+artificial latency, and ``POST /v1/chat/completions`` (plain or streamed as
+Server-Sent Events) with a configurable time to first token and per-token
+delay, so client-side behaviour can be measured without network access or
+API costs.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    latency: float = 0.05  # per embeddings request
+    dim: int = 1536
+    first_token_latency: float = 0.5  # chat completions
+    token_delay: float = 0.02
+    answer_tokens: int = 200
+    requests: int = 0
+    # Headers and body are separate writes: avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        type(self).requests += 1
+        payload = self._read_json()
+
+        if self.path.endswith("/embeddings"):
+            return self._embeddings(payload)
+        if self.path.endswith("/chat/completions"):
+            return self._chat_completions(payload)
+        self.send_error(404)
+
+    def _embeddings(self, payload: dict):
+        time.sleep(self.latency)
+        inputs = payload.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        data = []
+        for index, text in enumerate(inputs):
+            vector = _fake_vector(json.dumps(text), self.dim)
+            if payload.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode()
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        self._send_json(
+            {
+                "object": "list",
+                "data": data,
+                "model": payload.get("model", "fake"),
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            }
+        )
+
+
+    def _chat_completions(self, payload: dict):
+        model = payload.get("model", "fake")
+        tokens = [f"token{i} " for i in range(self.answer_tokens)]
+        time.sleep(self.first_token_latency)
+
+        if not payload.get("stream"):
+            time.sleep(self.token_delay * (len(tokens) - 1))
+            return self._send_json(
+                {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": "".join(tokens)},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                }
+            )
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for index, token in enumerate(tokens):
+            if index:
+                time.sleep(self.token_delay)
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": token},
+                        "finish_reason": None,
+                    }
+                ],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def _fake_vector(text: str, dim: int) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+    return np.random.default_rng(seed).normal(size=dim).astype(np.float32)
+
+
+class _FakeServer(ThreadingHTTPServer):
+    # Load tests open hundreds of connections at once
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+@contextmanager
+def fake_openai_server(handler: type = FakeOpenAIHandler):
+    """Runs the fake API on a free local port and yields its ``/v1`` base URL."""
+    server = _FakeServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    finally:
+        server.shutdown()
+        server.server_close()
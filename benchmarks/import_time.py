@@ -0,0 +1,96 @@
+"""
+Import-time budget for the API process.
+
+Imports ``app.main`` in fresh interpreters with ``python -X importtime``,
+reports the slowest top-level packages and any heavy dependency loaded at
+startup, and exits with status 1 when the cold start exceeds the budget or
+a heavy dependency is imported eagerly.
+
+Usage:
+    python -m benchmarks.import_time --budget-ms 1500
+    IMPORT_TIME_BUDGET_MS=1500 python -m benchmarks.import_time --runs 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+# Dependencies that must only be imported on first use
+HEAVY_MODULES = [
+    "langchain",
+    "langchain_community",
+    "langchain_core",
+    "langchain_openai",
+    "openai",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "fitz",
+    "docx",
+    "nltk",
+    "tiktoken",
+    "faiss",
+]
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Runs one cold import and returns the cumulative microseconds per module."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.setdefault("OPENAI_API_KEY", "import-time-check")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500")),
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # Best of N: the budget is about import work, not a noisy machine
+    runs = [_import_times(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda times: times[args.module])
+    total_ms = best[args.module] / 1000
+
+    packages = defaultdict(int)
+    for name, cumulative in best.items():
+        if "." not in name:
+            packages[name] = max(packages[name], cumulative)
+
+    print(f"Slowest top-level imports of {args.module}:")
+    for name, cumulative in sorted(packages.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {cumulative / 1000:9.1f} ms  {name}")
+
+    eager = [name for name in HEAVY_MODULES if name in best]
+    print(f"\ncold import of {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if eager:
+        print(f"heavy dependencies imported at startup: {', '.join(eager)}")
+
+    if total_ms > args.budget_ms or eager:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
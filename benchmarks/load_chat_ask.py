@@ -0,0 +1,217 @@
+"""
+Load test: concurrent questions served by one API worker, /chat/{chat_id}/ask
+(sync, thread pool) vs /chat/{chat_id}/ask/async (event loop).
+
+Serves the real FastAPI app with a single uvicorn worker, in its own process,
+against a temporary SQLite database (sync engine for /ask, aiosqlite for
+/ask/async) and a local fake OpenAI server with fixed embedding and
+completion latencies. For each
+concurrency level, that many clients ask questions back to back for a fixed
+time; throughput, latency percentiles and errors are reported per endpoint.
+
+A level counts as sustained when no request failed and the p95 latency stays
+within ``--slo`` times the single-client latency of the same endpoint.
+
+Usage:
+    python -m benchmarks.load_chat_ask --levels 1,16,64,128 --duration 5
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# Let the OpenAI connection pool follow the load instead of capping it
+os.environ.setdefault("OPENAI_MAX_CONNECTIONS", "512")
+
+import httpx
+from sqlalchemy import event
+from sqlmodel import SQLModel, create_engine
+
+from benchmarks.bench_chat_stream import _free_port, _seed
+from benchmarks.fake_openai import FakeOpenAIHandler, fake_openai_server
+
+ENDPOINTS = {"sync": "/chat/{chat_id}/ask", "async": "/chat/{chat_id}/ask/async"}
+
+
+def _sqlite_pragmas(dbapi_connection, _record) -> None:
+    # WAL lets readers proceed while another connection writes
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+async def _run_level(
+    base_url: str, path: str, concurrency: int, duration: float
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json={"question": "What is RAG?"})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        "concurrency": concurrency,
+        "done": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(ordered) if ordered else float("nan"),
+        "p95": ordered[int(len(ordered) * 0.95) - 1] if ordered else float("nan"),
+    }
+
+
+def _serve_app(db_path: str, openai_url: str, port: int) -> None:
+    """Runs the API in a separate process, as a single uvicorn worker would."""
+    import uvicorn
+    from langchain_openai import OpenAIEmbeddings
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlmodel import Session
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from app.core.config import settings
+    from app.core.database import get_async_session, get_session
+    from app.core.resources import Resources
+    from app.domain.chat import async_service
+    from app.main import app
+
+    # Per-request DEBUG logging would dominate the measurement
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+    os.environ["OPENAI_BASE_URL"] = openai_url
+
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"timeout": 60})
+    event.listen(engine, "connect", _sqlite_pragmas)
+    # The async path runs retrieval in a thread on the sync engine
+    async_service.engine = engine
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        connect_args={"timeout": 60},
+        pool_size=settings.ASYNC_DB_POOL_SIZE,
+        max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    )
+    event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+
+    def sqlite_session():
+        with Session(engine) as session:
+            yield session
+
+    async def aiosqlite_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    resources = Resources()
+    # No tiktoken download for context-length checks in the sandbox
+    resources._embeddings = OpenAIEmbeddings(
+        base_url=openai_url,
+        check_embedding_ctx_length=False,
+        http_client=resources.http_client,
+        http_async_client=resources.async_http_client,
+    )
+    app.state.resources = resources
+    app.dependency_overrides[get_session] = sqlite_session
+    app.dependency_overrides[get_async_session] = aiosqlite_session
+
+    # lifespan="off": the lifespan would initialise Postgres and start workers
+    uvicorn.run(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+
+
+def _wait_until_up(base_url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(base_url + "/", timeout=1)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--levels", default="1,8,16,32,64,128")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--embedding-latency", type=float, default=0.05)
+    parser.add_argument("--completion-latency", type=float, default=1.0)
+    parser.add_argument("--chunks", type=int, default=50)
+    parser.add_argument("--slo", type=float, default=2.0)
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+
+    FakeOpenAIHandler.latency = args.embedding_latency
+    FakeOpenAIHandler.first_token_latency = args.completion_latency
+    FakeOpenAIHandler.token_delay = 0
+    FakeOpenAIHandler.answer_tokens = 20
+
+    with tempfile.TemporaryDirectory() as tmp, fake_openai_server() as openai_url:
+        db_path = Path(tmp) / "bench.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        event.listen(engine, "connect", _sqlite_pragmas)
+        SQLModel.metadata.create_all(engine)
+        chat_id = _seed(engine, args.chunks)
+        engine.dispose()
+
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = multiprocessing.get_context("spawn").Process(
+            target=_serve_app, args=(str(db_path), openai_url, port), daemon=True
+        )
+        server.start()
+        results: dict[str, list[dict]] = {}
+        try:
+            _wait_until_up(base_url)
+            for name, template in ENDPOINTS.items():
+                path = template.format(chat_id=chat_id)
+                results[name] = [
+                    asyncio.run(_run_level(base_url, path, level, args.duration))
+                    for level in levels
+                ]
+        finally:
+            server.terminate()
+            server.join()
+
+    print(
+        f"fake OpenAI: embeddings {args.embedding_latency * 1000:.0f} ms, "
+        f"completion {args.completion_latency * 1000:.0f} ms; "
+        f"{args.duration:.0f} s per level, one uvicorn worker"
+    )
+    for name, rows in results.items():
+        baseline = rows[0]["p50"]
+        sustained = 0
+        print(f"\n{name:6} {ENDPOINTS[name]}")
+        print(f"  {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+        for row in rows:
+            ok = row["errors"] == 0 and row["p95"] <= baseline * args.slo
+            if ok:
+                sustained = max(sustained, row["concurrency"])
+            print(
+                f"  {row['concurrency']:>7} {row['rps']:>8.1f} {row['p50'] * 1000:>8.0f} "
+                f"{row['p95'] * 1000:>8.0f} {row['errors']:>7}{'' if ok else '  *'}"
+            )
+        print(f"  sustained: {sustained} concurrent asks (p95 <= {args.slo:g}x single-client p50)")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from app.domain.chat.models import Chat
 from app.domain.message.models import Message
 from app.domain.user.models import User
 from app.domain.document.models import Document, DocumentChunk
+from app.domain.job.models import IngestionJob
 
 
 config = context.config
@@ -0,0 +1,65 @@
+"""add pgvector embedding column
+
+Revision ID: a3c5e1f27b90
+Revises: 196890977287
+Create Date: 2026-10-18 09:12:41.118204+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e1f27b90'
+down_revision: Union[str, Sequence[str], None] = '196890977287'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _pgvector_available() -> bool:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    query = sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")
+    return bind.execute(query).scalar() is not None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Plain Postgres / SQLite keep the pure-Python retrieval backend
+    if not _pgvector_available():
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.execute(
+        "ALTER TABLE document_chunk "
+        f"ADD COLUMN embedding_vector vector({settings.EMBEDDING_DIM})"
+    )
+    op.execute(
+        "UPDATE document_chunk SET embedding_vector = embedding::text::vector "
+        "WHERE embedding IS NOT NULL"
+    )
+
+    if settings.PGVECTOR_INDEX == "ivfflat":
+        op.execute(
+            "CREATE INDEX ix_document_chunk_embedding_vector ON document_chunk "
+            "USING ivfflat (embedding_vector vector_cosine_ops) WITH (lists = 100)"
+        )
+    else:
+        op.execute(
+            "CREATE INDEX ix_document_chunk_embedding_vector ON document_chunk "
+            "USING hnsw (embedding_vector vector_cosine_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_document_chunk_embedding_vector")
+    op.execute("ALTER TABLE document_chunk DROP COLUMN IF EXISTS embedding_vector")
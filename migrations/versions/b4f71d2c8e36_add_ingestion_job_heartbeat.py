@@ -0,0 +1,32 @@
+"""add ingestion job heartbeat
+
+Revision ID: b4f71d2c8e36
+Revises: f2a8d35c9e14
+Create Date: 2026-10-18 15:02:41.518204+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f71d2c8e36'
+down_revision: Union[str, Sequence[str], None] = 'f2a8d35c9e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ingestion_job', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    # Jobs left running by a previous deploy expire from their start time
+    op.execute("UPDATE ingestion_job SET heartbeat_at = started_at WHERE status = 'running'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('ingestion_job') as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,75 @@
+"""binary chunk embeddings
+
+Revision ID: c7d2b84e1f03
+Revises: a3c5e1f27b90
+Create Date: 2026-10-18 10:02:17.540961+00:00
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.utils.embedding_codec import decode_embedding, encode_embedding
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2b84e1f03'
+down_revision: Union[str, Sequence[str], None] = 'a3c5e1f27b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _backfill(source: str, target: str, convert) -> None:
+    """Copies ``source`` into ``target`` through ``convert``, in id batches."""
+    bind = op.get_bind()
+    select_stmt = sa.text(
+        f"SELECT id, {source} FROM document_chunk "
+        f"WHERE id > :last_id AND {source} IS NOT NULL ORDER BY id LIMIT :limit"
+    )
+    update_stmt = sa.text(f"UPDATE document_chunk SET {target} = :value WHERE id = :id")
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            select_stmt, {"last_id": last_id, "limit": BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            update_stmt, [{"id": row_id, "value": convert(value)} for row_id, value in rows]
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('document_chunk', sa.Column('embedding_bin', sa.LargeBinary(), nullable=True))
+
+    def to_binary(value):
+        vector = json.loads(value) if isinstance(value, str) else value
+        return encode_embedding(vector, settings.EMBEDDING_STORAGE_FORMAT)
+
+    _backfill("embedding", "embedding_bin", to_binary)
+
+    with op.batch_alter_table('document_chunk') as batch_op:
+        batch_op.drop_column('embedding')
+        batch_op.alter_column('embedding_bin', new_column_name='embedding')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('document_chunk', sa.Column('embedding_json', sa.JSON(), nullable=True))
+
+    def to_json(value):
+        return json.dumps(decode_embedding(bytes(value)).tolist())
+
+    _backfill("embedding", "embedding_json", to_json)
+
+    with op.batch_alter_table('document_chunk') as batch_op:
+        batch_op.drop_column('embedding')
+        batch_op.alter_column('embedding_json', new_column_name='embedding')
@@ -0,0 +1,49 @@
+"""add chunk content hash
+
+Revision ID: f2a8d35c9e14
+Revises: e41b9c6d2a75
+Create Date: 2026-10-18 12:47:33.261870+00:00
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8d35c9e14'
+down_revision: Union[str, Sequence[str], None] = 'e41b9c6d2a75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('document_chunk', sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE document_chunk "
+            "SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex')"
+        )
+        return
+
+    rows = bind.execute(sa.text("SELECT id, content FROM document_chunk")).all()
+    if rows:
+        bind.execute(
+            sa.text("UPDATE document_chunk SET content_hash = :hash WHERE id = :id"),
+            [
+                {"id": row_id, "hash": hashlib.sha256(content.encode("utf-8")).hexdigest()}
+                for row_id, content in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('document_chunk') as batch_op:
+        batch_op.drop_column('content_hash')